@@ -3,20 +3,39 @@
 Command-line interface for shipping data parsing.
 """
 
+import io
 import os
+import csv
 import sys
+import mmap
+import stat
 import logging
+import functools
+import dataclasses
+from contextlib import contextmanager
+from itertools import chain
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import List, Dict, Protocol, Optional
+from typing import List, Dict, Iterable, Iterator, Protocol, Optional
 import argparse
 
-from models import ShippingRecord
+from models import (
+    COL_VESSEL_NAME, COL_QUANTITY_MT,
+    COL_LAYCAN_START_DATE, COL_TOTAL_FREIGHT_USD
+)
 from config import AppConfig, ParserConfig
-from shipping_parser import ShippingDataParser
+
+# shipping_parser is imported where it is used, so that
+# `--help` and argument errors don't pay their import cost
 
 logger = logging.getLogger(__name__)
 
+# Placeholder value used for missing fields in parsed records
+NA = 'N/A'
+
+# Exact value types counted as numeric quantities/freight in summaries
+_NUMERIC_TYPES = (int, float)
+
 
 # ============ PROTOCOLS & INTERFACES ============
 
@@ -27,6 +46,22 @@ class DataReader(Protocol):
         ...
 
 
+class StreamingDataReader(ABC):
+    """Base class for readers that can also yield input line by line.
+
+    Readers opt in by subclassing, and the CLI then parses while it reads;
+    any other DataReader is read in full first.
+    """
+
+    @abstractmethod
+    def read_data(self) -> str:
+        """Read and return input data."""
+
+    @abstractmethod
+    def iter_lines(self) -> Iterator[str]:
+        """Yield input lines as they are read."""
+
+
 class DataWriter(Protocol):
     """Protocol for writing output data."""
     def write_data(self, records: List[Dict], filename: str) -> bool:
@@ -40,6 +75,10 @@ class ShippingParserProtocol(Protocol):
         """Parse raw text into structured records."""
         ...
 
+    def parse_stream(self, lines: Iterable[str]) -> Iterator[Dict]:
+        """Parse lines lazily, yielding records as they are produced."""
+        ...
+
     def save_to_excel(self, records: List[Dict], filename: str) -> bool:
         """Save records to Excel file."""
         ...
@@ -47,7 +86,24 @@ class ShippingParserProtocol(Protocol):
 
 # ============ CONCRETE IMPLEMENTATIONS ============
 
-class StdinDataReader:
+@contextmanager
+def _stdin_text() -> Iterator[io.TextIOWrapper]:
+    """Open stdin as text in its own encoding, with universal newlines.
+
+    sys.stdin only splits on "\\n" on POSIX, so a pasted "\\r\\n" or "\\r"
+    line ending would otherwise reach the parser intact.
+    """
+    stream = io.TextIOWrapper(
+        sys.stdin.buffer, encoding=sys.stdin.encoding, errors=sys.stdin.errors, newline=None
+    )
+    try:
+        yield stream
+    finally:
+        # Hand the buffer back rather than letting the wrapper close stdin
+        stream.detach()
+
+
+class StdinDataReader(StreamingDataReader):
     """Reads data from standard input."""
 
     def __init__(self, prompt_message: str = None):
@@ -59,17 +115,34 @@ class StdinDataReader:
             print(self.prompt_message)
 
         try:
-            return sys.stdin.read()
+            with _stdin_text() as stdin:
+                return stdin.read()
         except KeyboardInterrupt:
             logger.info("Operation cancelled by user")
             print("\n❌ Operation cancelled by user.")
             sys.exit(0)
         except Exception as e:
-            logger.error(f"Error reading from stdin: {e}")
+            logger.error("Error reading from stdin: %s", e)
             raise RuntimeError(f"Failed to read input: {e}")
 
+    def iter_lines(self) -> Iterator[str]:
+        """Yield lines from stdin as they arrive."""
+        if self.prompt_message:
+            print(self.prompt_message)
 
-class FileDataReader:
+        try:
+            with _stdin_text() as stdin:
+                yield from stdin
+        except KeyboardInterrupt:
+            logger.info("Operation cancelled by user")
+            print("\n❌ Operation cancelled by user.")
+            sys.exit(0)
+        except Exception as e:
+            logger.error("Error reading from stdin: %s", e)
+            raise RuntimeError(f"Failed to read input: {e}")
+
+
+class FileDataReader(StreamingDataReader):
     """Reads data from a file."""
 
     def __init__(self, filepath: str):
@@ -81,9 +154,38 @@ class FileDataReader:
             raise FileNotFoundError(f"Input file not found: {self.filepath}")
 
         try:
-            return self.filepath.read_text(encoding='utf-8')
+            with open(self.filepath, 'rb') as f:
+                st = os.fstat(f.fileno())
+                # Pipes, FIFOs and devices can't be mapped, and their size is
+                # not their length; mmap also can't map a zero-length file
+                if not stat.S_ISREG(st.st_mode) or st.st_size == 0:
+                    return io.TextIOWrapper(f, encoding='utf-8').read()
+
+                # Decode straight from the mapped pages, avoiding an
+                # intermediate bytes copy of the whole file
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    text = str(mm, 'utf-8')
+
+            # Match text mode's universal newlines
+            if '\r' in text:
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+            return text
+        except Exception as e:
+            logger.error("Error reading file %s: %s", self.filepath, e)
+            raise RuntimeError(f"Failed to read file {self.filepath}: {e}")
+
+    def iter_lines(self) -> Iterator[str]:
+        """Yield lines from the file without reading it all up front."""
+        if not self.filepath.exists():
+            raise FileNotFoundError(f"Input file not found: {self.filepath}")
+
+        try:
+            with open(self.filepath, encoding='utf-8') as f:
+                yield from f
         except Exception as e:
-            logger.error(f"Error reading file {self.filepath}: {e}")
+            logger.error("Error reading file %s: %s", self.filepath, e)
             raise RuntimeError(f"Failed to read file {self.filepath}: {e}")
 
 
@@ -98,6 +200,35 @@ class ExcelDataWriter:
         return self.parser.save_to_excel(records, filename)
 
 
+class CsvDataWriter:
+    """Writes data to CSV format, which is far cheaper to produce than Excel."""
+
+    def write_data(self, records: List[Dict], filename: str) -> bool:
+        """Write records to CSV file."""
+        if not records:
+            logger.warning("No records to save")
+            return False
+
+        try:
+            with open(filename, 'w', newline='', encoding='utf-8') as file:
+                writer = csv.DictWriter(file, fieldnames=list(records[0]))
+                writer.writeheader()
+                writer.writerows(records)
+
+            logger.info("Saved %d records to %s", len(records), filename)
+            return True
+        except Exception as e:
+            logger.error("Failed to save to CSV: %s", e)
+            return False
+
+
+def _create_data_writer(parser: ShippingParserProtocol, filename: str) -> DataWriter:
+    """Pick the writer matching the output file's extension."""
+    if filename.endswith('.csv'):
+        return CsvDataWriter()
+    return ExcelDataWriter(parser)
+
+
 # ============ BUSINESS LOGIC ============
 
 class ShippingDataProcessor:
@@ -108,7 +239,7 @@ class ShippingDataProcessor:
 
     def process_data(self, raw_data: str) -> List[Dict]:
         """Process raw data into structured records."""
-        if not raw_data or not raw_data.strip():
+        if not raw_data or raw_data.isspace():
             raise ValueError("No data provided")
 
         logger.info("Processing shipping data...")
@@ -117,30 +248,36 @@ class ShippingDataProcessor:
         if not records:
             raise ValueError("No valid records could be parsed from the input data")
 
-        logger.info(f"Successfully processed {len(records)} records")
+        logger.info("Successfully processed %d records", len(records))
         return records
 
-    def get_summary(self, records: List[Dict]) -> Dict:
-        """Generate summary statistics for processed records."""
-        total_records = len(records)
+    def process_stream(self, lines: Iterable[str]) -> List[Dict]:
+        """Process input lines as they are read, overlapping parsing with I/O."""
+        logger.info("Processing shipping data stream...")
+        records = list(self.parser.parse_stream(lines))
 
-        complete_records = sum(
-            1 for record in records
-            if (record.get('Vessel Name', 'N/A') != 'N/A' and
-                record.get('Quantity (MT)', 'N/A') != 'N/A' and
-                isinstance(record.get('Quantity (MT)'), (int, float)))
-        )
+        if not records:
+            raise ValueError("No valid records could be parsed from the input data")
 
-        laycan_records = sum(
-            1 for record in records
-            if record.get('Laycan Start Date') is not None
-        )
+        logger.info("Successfully processed %d records", len(records))
+        return records
 
-        freight_records = sum(
-            1 for record in records
-            if (record.get('Total Freight (USD)', 'N/A') != 'N/A' and
-                isinstance(record.get('Total Freight (USD)'), (int, float)))
-        )
+    def get_summary(self, records: List[Dict]) -> Dict:
+        """Generate summary statistics for processed records."""
+        total_records = len(records)
+        complete_records = laycan_records = freight_records = 0
+
+        # Single pass over the records, counting all categories at once.
+        # Module globals are bound to locals so the loop only does fast local loads.
+        na, numeric_types = NA, _NUMERIC_TYPES
+        for record in records:
+            get = record.get
+            if get(COL_VESSEL_NAME, na) != na and type(get(COL_QUANTITY_MT)) in numeric_types:
+                complete_records += 1
+            if get(COL_LAYCAN_START_DATE) is not None:
+                laycan_records += 1
+            if type(get(COL_TOTAL_FREIGHT_USD)) in numeric_types:
+                freight_records += 1
 
         return {
             'total_records': total_records,
@@ -183,11 +320,13 @@ class ShippingDataCLI:
         try:
             self._print_header()
 
-            # Read input
-            raw_data = self._read_input()
-
-            # Process data
-            records = self._process_data(raw_data)
+            # Read and process input, parsing as lines arrive when the
+            # reader can stream them
+            if isinstance(self.data_reader, StreamingDataReader):
+                records = self._process_stream(self._read_input_lines())
+            else:
+                raw_data = self._read_input()
+                records = self._process_data(raw_data)
 
             # Save output
             self._save_output(records)
@@ -207,30 +346,46 @@ class ShippingDataCLI:
 
     def _print_header(self) -> None:
         """Print application header."""
-        print("🚢 Shipping Data Parsing Tool")
-        print("=" * 50)
+        print("🚢 Shipping Data Parsing Tool\n" + "=" * 50)
 
     def _read_input(self) -> str:
         """Read and validate input data."""
         logger.info("Reading input data...")
         raw_data = self.data_reader.read_data()
 
-        if not raw_data.strip():
+        if not raw_data or raw_data.isspace():
             raise ValueError("No data was provided")
 
-        logger.info(f"Read {len(raw_data)} characters of input data")
+        logger.info("Read %d characters of input data", len(raw_data))
         return raw_data
 
+    def _read_input_lines(self) -> Iterator[str]:
+        """Start reading input lines, checking that there is any data."""
+        logger.info("Reading input data...")
+        lines = self.data_reader.iter_lines()
+        first_line = next((line for line in lines if line.strip()), None)
+
+        if first_line is None:
+            raise ValueError("No data was provided")
+
+        return chain([first_line], lines)
+
     def _process_data(self, raw_data: str) -> List[Dict]:
         """Process the raw data."""
         logger.info("Parsing shipping data...")
         print("⚙️  Parsing the provided data...")
         return self.processor.process_data(raw_data)
 
+    def _process_stream(self, lines: Iterable[str]) -> List[Dict]:
+        """Process input lines while they are still being read."""
+        logger.info("Parsing shipping data...")
+        print("⚙️  Parsing the provided data...")
+        return self.processor.process_stream(lines)
+
     def _save_output(self, records: List[Dict]) -> None:
         """Save processed records to file."""
         print(f"💾 Saving data to '{self.config.output_filename}'...")
-        logger.info(f"Saving {len(records)} records to {self.config.output_filename}")
+        logger.info("Saving %d records to %s", len(records), self.config.output_filename)
 
         success = self.data_writer.write_data(records, self.config.output_filename)
         if not success:
@@ -241,17 +396,20 @@ class ShippingDataCLI:
     def _show_summary(self, records: List[Dict]) -> None:
         """Display processing summary."""
         output_path = Path(self.config.output_filename).resolve()
-
-        print("\n🎉 Process complete!")
-        print(f"   File saved: {output_path}")
-
         summary = self.processor.get_summary(records)
-        print(f"\n📊 Summary:")
-        print(f"   - Total records: {summary['total_records']}")
-        print(f"   - Complete records: {summary['complete_records']}")
-        print(f"   - Records with laycan dates: {summary['laycan_records']}")
-        print(f"   - Records with freight calculations: {summary['freight_records']}")
-        print(f"   - Completion rate: {summary['completion_rate']:.1%}")
+
+        # Emit the whole block with a single print call
+        lines = [
+            "\n🎉 Process complete!",
+            f"   File saved: {output_path}",
+            "\n📊 Summary:",
+            f"   - Total records: {summary['total_records']}",
+            f"   - Complete records: {summary['complete_records']}",
+            f"   - Records with laycan dates: {summary['laycan_records']}",
+            f"   - Records with freight calculations: {summary['freight_records']}",
+            f"   - Completion rate: {summary['completion_rate']:.1%}",
+        ]
+        print("\n".join(lines))
 
     def _handle_error(self, message: str, exit_code: int = 1) -> None:
         """Handle and log errors, then exit."""
@@ -262,6 +420,25 @@ class ShippingDataCLI:
 
 # ============ FACTORY & DEPENDENCY INJECTION ============
 
+def _config_key(config) -> tuple:
+    """Build a hashable key from a configuration dataclass's field values."""
+    return tuple(
+        tuple(value) if isinstance(value, list) else value
+        for value in dataclasses.astuple(config)
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _get_parser(app_key: tuple, parser_key: tuple):
+    """Return a shared parser for the given configuration keys.
+
+    The parser gets its own configuration objects rebuilt from the keys, so
+    later changes to the caller's configs cannot leak into a cached parser.
+    """
+    from shipping_parser import ShippingDataParser
+    return ShippingDataParser(AppConfig(*app_key), ParserConfig(*map(list, parser_key)))
+
+
 class CLIFactory:
     """Factory for creating CLI application with dependencies."""
 
@@ -274,12 +451,12 @@ class CLIFactory:
         # Validate configuration
         app_config.validate()
 
-        # Create parser
-        parser = ShippingDataParser(app_config, parser_config)
+        # Create (or reuse) parser
+        parser = _get_parser(_config_key(app_config), _config_key(parser_config))
 
         # Create components
         data_reader = StdinDataReader(app_config.stdin_prompt_message)
-        data_writer = ExcelDataWriter(parser)
+        data_writer = _create_data_writer(parser, app_config.output_filename)
         processor = ShippingDataProcessor(parser)
 
         return ShippingDataCLI(app_config, data_reader, data_writer, processor)
@@ -301,12 +478,12 @@ class CLIFactory:
         # Validate configuration
         app_config.validate()
 
-        # Create parser
-        parser = ShippingDataParser(app_config, parser_config)
+        # Create (or reuse) parser
+        parser = _get_parser(_config_key(app_config), _config_key(parser_config))
 
         # Create components
         data_reader = FileDataReader(input_file)
-        data_writer = ExcelDataWriter(parser)
+        data_writer = _create_data_writer(parser, app_config.output_filename)
         processor = ShippingDataProcessor(parser)
 
         return ShippingDataCLI(app_config, data_reader, data_writer, processor)
@@ -321,6 +498,36 @@ class CLIFactory:
 
 # ============ ARGUMENT PARSING ============
 
+# Command-line options as (flag, ..., add_argument keyword arguments)
+_ARGUMENT_SPECS = (
+    ('-i', '--input', {
+        'help': 'Input file path (if not provided, reads from stdin)',
+    }),
+    ('-o', '--output', {
+        'default': 'parsed_shipping_data.xlsx',
+        'help': 'Output file path, .xlsx or .csv (default: %(default)s)',
+    }),
+    ('--year', {
+        'type': int,
+        'default': None,
+        'help': 'Default year for date parsing (default: current year)',
+    }),
+    ('--log-level', {
+        'choices': ['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+        'default': 'INFO',
+        'help': 'Logging level (default: %(default)s)',
+    }),
+    ('--no-typo-correction', {
+        'action': 'store_true',
+        'help': 'Disable automatic typo correction',
+    }),
+    ('--no-freight-calculation', {
+        'action': 'store_true',
+        'help': 'Disable freight calculation',
+    }),
+)
+
+
 def create_argument_parser() -> argparse.ArgumentParser:
     """Create command-line argument parser."""
     parser = argparse.ArgumentParser(
@@ -331,47 +538,14 @@ Examples:
   %(prog)s                           # Read from stdin
   %(prog)s -i input.txt              # Read from file
   %(prog)s -i input.txt -o output.xlsx   # Read from file, custom output
+  %(prog)s -i input.txt -o output.csv    # Write CSV instead of Excel
   %(prog)s --year 2023               # Use 2023 as default year
   %(prog)s --log-level DEBUG         # Enable debug logging
         """
     )
 
-    parser.add_argument(
-        '-i', '--input',
-        help='Input file path (if not provided, reads from stdin)'
-    )
-
-    parser.add_argument(
-        '-o', '--output',
-        default='parsed_shipping_data.xlsx',
-        help='Output Excel file path (default: %(default)s)'
-    )
-
-    parser.add_argument(
-        '--year',
-        type=int,
-        default=None,
-        help='Default year for date parsing (default: current year)'
-    )
-
-    parser.add_argument(
-        '--log-level',
-        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
-        default='INFO',
-        help='Logging level (default: %(default)s)'
-    )
-
-    parser.add_argument(
-        '--no-typo-correction',
-        action='store_true',
-        help='Disable automatic typo correction'
-    )
-
-    parser.add_argument(
-        '--no-freight-calculation',
-        action='store_true',
-        help='Disable freight calculation'
-    )
+    for *flags, options in _ARGUMENT_SPECS:
+        parser.add_argument(*flags, **options)
 
     return parser
 
@@ -392,7 +566,7 @@ def main():
         # Create configuration from arguments
         app_config = AppConfig(
             output_filename=args.output,
-            default_year=args.year or AppConfig().default_year,
+            default_year=args.year or AppConfig.default_year,
             log_level=args.log_level,
             enable_typo_correction=not args.no_typo_correction,
             enable_freight_calculation=not args.no_freight_calculation
@@ -52,8 +52,8 @@ class AppConfig:
         if self.log_level.upper() not in valid_log_levels:
             raise ValueError(f"Invalid log level: {self.log_level}. Must be one of {valid_log_levels}")
 
-        if not self.output_filename.endswith(('.xlsx', '.xls')):
-            raise ValueError(f"Output filename must end with .xlsx or .xls: {self.output_filename}")
+        if not self.output_filename.endswith(('.xlsx', '.xls', '.csv')):
+            raise ValueError(f"Output filename must end with .xlsx, .xls or .csv: {self.output_filename}")
 
 
 @dataclass
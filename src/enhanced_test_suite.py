@@ -1,25 +1,36 @@
 import unittest
+import functools
 import logging
-from unittest.mock import patch, MagicMock
-from datetime import datetime
+import os
 import sys
+import time
 
 # Import your actual modules
 from shipping_parser import ShippingDataParser
-from config import ParserConfig
+from config import AppConfig, ParserConfig
+
+# Test data that was failing
+TEST_DATA = "VESSEL 25-28 JUNE CARGO FROM PORT TO PORT2"
 
 
 class TestDateParsingEnhanced(unittest.TestCase):
     """Enhanced version of the date parsing test with comprehensive debugging"""
 
+    # Expected laycan (start, end) for the test data, per configured year
+    EXPECTED_DATES = {year: (f'{year}-06-25', f'{year}-06-28') for year in (2023, 2024, 2025)}
+
+    @classmethod
+    def setUpClass(cls):
+        """Configure logging once for the whole test case"""
+        # Set TEST_LOG=DEBUG to enable detailed logging for debugging
+        level = os.environ.get("TEST_LOG", "WARNING").upper()
+        logging.basicConfig(level=level, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
     def setUp(self):
         """Set up test environment with consistent state"""
-        # Enable detailed logging for debugging
-        logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         self.logger = logging.getLogger(__name__)
 
-        # Test data that was failing
-        self.test_data = "VESSEL 25-28 JUNE CARGO FROM PORT TO PORT2"
+        self.test_data = TEST_DATA
 
         # Years to test
         self.test_years = [2023, 2024, 2025]
@@ -34,7 +45,7 @@ class TestDateParsingEnhanced(unittest.TestCase):
 
         for year in self.test_years:
             with self.subTest(year=year):
-                self.logger.info(f"Testing year configuration: {year}")
+                self.logger.info("Testing year configuration: %s", year)
 
                 # Create parser with specific year configuration
                 try:
@@ -42,25 +53,25 @@ class TestDateParsingEnhanced(unittest.TestCase):
                     self.assertIsNotNone(parser, f"Parser creation failed for year {year}")
 
                     # Log the configuration
-                    self.logger.debug(f"Parser configuration: year={year}")
+                    self.logger.debug("Parser configuration: year=%s", year)
 
                     # Parse the test data
-                    self.logger.debug(f"Input data: '{self.test_data}'")
-                    records = parser.parse(self.test_data)
+                    self.logger.debug("Input data: %r", self.test_data)
+                    records = parser.parse_records(self.test_data)
 
                     # Debug the parsing results
-                    self.logger.debug(f"Number of records parsed: {len(records)}")
+                    self.logger.debug("Number of records parsed: %d", len(records))
                     self.assertGreater(len(records), 0, f"No records parsed for year {year}")
 
                     record = records[0]
-                    self.logger.debug(f"First record: {record}")
+                    self.logger.debug("First record: %s", record)
 
                     # Check all date-related fields
-                    laycan_start = record.get('Laycan Start Date')
-                    laycan_end = record.get('Laycan End Date')
+                    laycan_start = record.laycan_start_date
+                    laycan_end = record.laycan_end_date
 
-                    self.logger.debug(f"Laycan Start Date: {laycan_start}")
-                    self.logger.debug(f"Laycan End Date: {laycan_end}")
+                    self.logger.debug("Laycan Start Date: %s", laycan_start)
+                    self.logger.debug("Laycan End Date: %s", laycan_end)
 
                     # Enhanced assertions with better error messages
                     self.assertIsNotNone(
@@ -68,7 +79,7 @@ class TestDateParsingEnhanced(unittest.TestCase):
                         f"Laycan Start Date is None for year {year}. Full record: {record}"
                     )
 
-                    expected_start_date = f'{year}-06-25'
+                    expected_start_date, expected_end_date = self.EXPECTED_DATES[year]
                     self.assertEqual(
                         laycan_start,
                         expected_start_date,
@@ -77,7 +88,6 @@ class TestDateParsingEnhanced(unittest.TestCase):
 
                     # Additional validation for end date
                     if laycan_end:
-                        expected_end_date = f'{year}-06-28'
                         self.assertEqual(
                             laycan_end,
                             expected_end_date,
@@ -85,27 +95,34 @@ class TestDateParsingEnhanced(unittest.TestCase):
                         )
 
                 except Exception as e:
-                    self.logger.error(f"Exception during parsing for year {year}: {e}")
-                    self.logger.error(f"Exception type: {type(e)}")
-                    import traceback
-                    self.logger.error(f"Traceback: {traceback.format_exc()}")
+                    self.logger.error("Exception during parsing for year %s: %s", year, e)
+                    self.logger.error("Exception type: %s", type(e))
+                    self.logger.error("Traceback:", exc_info=True)
                     raise
 
     def _create_parser_with_year(self, year):
-        """Helper method to create parser with specific year configuration"""
+        """Helper method to get a parser with specific year configuration"""
         try:
-            config = ParserConfig()
-            config.year = year
-            config.enable_typo_correction = True
-            config.enable_freight_calculation = True
-
-            parser = ShippingDataParser(config)
-            return parser
+            return self._get_parser(year)
 
         except Exception as e:
-            self.logger.error(f"Failed to create parser for year {year}: {e}")
+            self.logger.error("Failed to create parser for year %s: %s", year, e)
             raise
 
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _get_parser(cls, year, typo=True, freight=True):
+        """Build one parser per configuration and reuse it across subtests"""
+        # Parsing only fills memo caches keyed by the input and year, so a
+        # shared parser needs no reset between uses
+        app_config = AppConfig(
+            default_year=year,
+            enable_typo_correction=typo,
+            enable_freight_calculation=freight
+        )
+
+        return ShippingDataParser(app_config, parser_config=ParserConfig())
+
     def test_date_parsing_edge_cases(self):
         """Test various edge cases in date parsing"""
         edge_cases = [
@@ -118,31 +135,28 @@ class TestDateParsingEnhanced(unittest.TestCase):
 
         for test_data, case_name in edge_cases:
             with self.subTest(case=case_name):
-                self.logger.info(f"Testing edge case: {case_name}")
-                self.logger.debug(f"Input: '{test_data}'")
+                self.logger.info("Testing edge case: %s", case_name)
+                self.logger.debug("Input: %r", test_data)
 
                 for year in [2023, 2024, 2025]:
                     with self.subTest(year=year):
                         parser = self._create_parser_with_year(year)
 
                         try:
-                            records = parser.parse(test_data)
+                            records = parser.parse_records(test_data)
                             if records:
                                 record = records[0]
-                                self.logger.debug(f"Parsed record for {case_name} (year {year}): {record}")
+                                self.logger.debug("Parsed record for %s (year %s): %s", case_name, year, record)
 
                                 # Basic validation - at least some date should be parsed
-                                has_dates = any(
-                                    record.get(field) for field in
-                                    ['Laycan Start Date', 'Laycan End Date']
-                                )
+                                has_dates = bool(record.laycan_start_date or record.laycan_end_date)
                                 if not has_dates:
-                                    self.logger.warning(f"No dates parsed for {case_name} with year {year}")
+                                    self.logger.warning("No dates parsed for %s with year %s", case_name, year)
                             else:
-                                self.logger.warning(f"No records parsed for {case_name} with year {year}")
+                                self.logger.warning("No records parsed for %s with year %s", case_name, year)
 
                         except Exception as e:
-                            self.logger.error(f"Error parsing {case_name} with year {year}: {e}")
+                            self.logger.error("Error parsing %s with year %s: %s", case_name, year, e)
                             # Don't fail the test for edge cases, just log the issues
 
     def test_parser_state_isolation(self):
@@ -156,17 +170,17 @@ class TestDateParsingEnhanced(unittest.TestCase):
         # Parse the same data with all parsers
         results = {}
         for year, parser in parsers.items():
-            results[year] = parser.parse(self.test_data)
+            results[year] = parser.parse_records(self.test_data)
 
         # Verify that each parser produced consistent results
         for year, records in results.items():
             if records:
                 record = records[0]
-                laycan_start = record.get('Laycan Start Date')
+                laycan_start = record.laycan_start_date
 
                 if laycan_start:
                     # Extract year from the parsed date
-                    parsed_year = laycan_start.split('-')[0]
+                    parsed_year = laycan_start[:4]
                     self.assertEqual(
                         parsed_year,
                         str(year),
@@ -179,16 +193,17 @@ class TestDateParsingEnhanced(unittest.TestCase):
         for year in self.test_years:
             with self.subTest(year=year):
                 parser = self._create_parser_with_year(year)
+                year_str = str(year)
 
                 # Parse multiple times to ensure configuration persists
                 for i in range(3):
-                    records = parser.parse(self.test_data)
+                    records = parser.parse_records(self.test_data)
 
-                    if records and records[0].get('Laycan Start Date'):
-                        parsed_year = records[0]['Laycan Start Date'].split('-')[0]
+                    if records and records[0].laycan_start_date:
+                        parsed_year = records[0].laycan_start_date[:4]
                         self.assertEqual(
                             parsed_year,
-                            str(year),
+                            year_str,
                             f"Configuration changed after {i + 1} parse operations"
                         )
 
@@ -199,32 +214,64 @@ class TestDateParsingEnhanced(unittest.TestCase):
             with self.subTest(year=year):
                 parser = self._create_parser_with_year(year)
 
-                self.logger.info(f"Step-by-step parsing for year {year}")
+                self.logger.info("Step-by-step parsing for year %s", year)
 
                 # Step 1: Check parser configuration
                 if hasattr(parser, 'config'):
-                    self.logger.debug(f"Parser config: {parser.config}")
+                    self.logger.debug("Parser config: %s", parser.config)
                     if hasattr(parser.config, 'year'):
-                        self.logger.debug(f"Config year: {parser.config.year}")
+                        self.logger.debug("Config year: %s", parser.config.year)
 
                 # Step 2: Parse and get detailed info
-                records = parser.parse(self.test_data)
+                records = parser.parse_records(self.test_data)
 
                 if records:
                     record = records[0]
 
                     # Step 3: Check each field
-                    for field_name, field_value in record.items():
-                        self.logger.debug(f"{field_name}: {field_value} (type: {type(field_value)})")
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        for field_name, field_value in record.to_dict().items():
+                            self.logger.debug("%s: %s (type: %s)", field_name, field_value, type(field_value))
 
                     # Step 4: Focus on the failing field
-                    laycan_start = record.get('Laycan Start Date')
+                    laycan_start = record.laycan_start_date
                     if laycan_start is None:
-                        self.logger.error(f"IDENTIFIED ISSUE: Laycan Start Date is None for year {year}")
-                        self.logger.error(f"This means the date parsing/construction logic is failing")
-                        self.logger.error(f"Full record: {record}")
+                        self.logger.error("IDENTIFIED ISSUE: Laycan Start Date is None for year %s", year)
+                        self.logger.error("This means the date parsing/construction logic is failing")
+                        self.logger.error("Full record: %s", record)
+
+
+# Report lines for the benchmark, one per common format; {n} numbers the vessel
+BENCH_LINES = (
+    "Dai Thanh {n}   12ktons POP   Balikpapan / South China   Usd 29.00 pmt 25-30 Jun Nova",
+    "Seagull {n} 10ktons Palm oil E.Malaysia / EC India  Usd 35 pmt  2H June Wilmar",
+    "P66 / Seaways Moment {n} / 32,000MT UCO + Tallow / Port Klang to USWC / 06-10 June / USD 2.15M Lumpsum",
+    "Bao Feng Hua {n} 8600  Benzene  Kandla / Jubail   Usd low 30ies    17-25 June Aramco",
+    "Golden Violet {n} 18ktons Palm oil   Padfng / WC India – Pakistan  Usd hi 30ies  mid Jul  Nova",
+)
+
+
+def _bench(vessels=2000, repeats=5):
+    """Time parsing a realistic report without unittest in the way"""
+    # Numbering the vessels makes every line distinct, so the parser's
+    # per-line cache can't turn the run into dictionary lookups
+    report = "\n".join(line.format(n=n) for n in range(vessels) for line in BENCH_LINES)
+
+    best = float('inf')
+    for _ in range(repeats):
+        # A fresh parser per run, so no run starts with warm caches
+        parser = ShippingDataParser(AppConfig(default_year=2024))
+        start = time.perf_counter()
+        records = parser.parse_records(report)
+        best = min(best, time.perf_counter() - start)
+    return len(records), best
 
 
 if __name__ == '__main__':
+    # Set BENCH=1 to time the parser instead of running the tests
+    if os.environ.get('BENCH'):
+        print("Parsed %d records in %.3fs" % _bench())
+        sys.exit(0)
+
     # Run with verbose output
     unittest.main(verbosity=2)
\ No newline at end of file
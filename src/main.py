@@ -1,13 +1,15 @@
 import os
 import sys
+from itertools import chain
 from pathlib import Path
 sys.path.append('src')
+from cli import _stdin_text
 from shipping_parser import ShippingDataParser
 
 
-def get_pasted_data():
+def iter_pasted_lines():
     """
-    Captures multi-line text pasted into the terminal by the user.
+    Yields lines of text pasted into the terminal by the user as they arrive.
 
     The user signals the end of their input by pressing Ctrl+D (on Mac/Linux)
     or Ctrl+Z followed by Enter (on Windows).
@@ -17,8 +19,10 @@ def get_pasted_data():
     print("-" * 60)
 
     try:
-        # sys.stdin.read() captures all input until the EOF (End-of-File) signal
-        return sys.stdin.read()
+        # Yield line by line so parsing can start before the EOF
+        # (End-of-File) signal and the whole paste is never held at once
+        with _stdin_text() as stdin:
+            yield from stdin
     except KeyboardInterrupt:
         print("\n\n❌ Operation cancelled by user.")
         sys.exit(0)
@@ -33,21 +37,22 @@ def main():
     """
     print("--- 🚢 Shipping Data Parsing Tool ---")
 
-    # 1. Get the raw data from the user
-    raw_data = get_pasted_data()
+    # 1. Initialize the parser
+    print("\n⚙️  Initializing parser...")
+    parser = ShippingDataParser()
 
-    if not raw_data.strip():
+    # 2. Get the raw data from the user, skipping any leading blank lines
+    lines = iter_pasted_lines()
+    first_line = next((line for line in lines if line.strip()), None)
+
+    if first_line is None:
         print("\n❌ No data was provided. Exiting application.")
         return
 
-    # 2. Initialize the parser
-    print("\n⚙️  Initializing parser...")
-    parser = ShippingDataParser()
-
-    # 3. Parse the data using the improved parser
+    # 3. Parse the data line by line as it is read
     print("⚙️  Parsing the provided data...")
     try:
-        parsed_records = parser.parse_shipping_data(raw_data)
+        parsed_records = list(parser.parse_stream(chain([first_line], lines)))
     except Exception as e:
         print(f"❌ Error during parsing: {e}")
         return
@@ -72,25 +77,25 @@ def main():
         print(f"❌ Error saving to Excel: {e}")
         return
 
-    # 5. Provide confirmation to the user
+    # 5. Optional: Count complete records and records with laycan dates in one pass
+    complete_records = laycan_records = 0
+    for record in parsed_records:
+        get = record.get
+        if get('Vessel Name', 'N/A') != 'N/A' and get('Quantity (MT)', 'N/A') != 'N/A':
+            complete_records += 1
+        if get('Laycan Start Date') is not None:
+            laycan_records += 1
+
+    # 6. Provide confirmation and summary to the user with a single print call
     output_path = Path(output_filename).resolve()
-    print("\n🎉 Process complete!")
-    print(f"   Your file is ready at: {output_path}")
-
-    # 6. Optional: Show a summary of what was parsed
-    print(f"\n📊 Summary:")
-    print(f"   - Total records: {len(parsed_records)}")
-
-    # Count records with complete data
-    complete_records = sum(1 for record in parsed_records
-                           if record.get('Vessel Name', 'N/A') != 'N/A'
-                           and record.get('Quantity (MT)', 'N/A') != 'N/A')
-    print(f"   - Complete records: {complete_records}")
-
-    # Count records with laycan dates
-    laycan_records = sum(1 for record in parsed_records
-                         if record.get('Laycan Start Date') is not None)
-    print(f"   - Records with laycan dates: {laycan_records}")
+    print("\n".join([
+        "\n🎉 Process complete!",
+        f"   Your file is ready at: {output_path}",
+        "\n📊 Summary:",
+        f"   - Total records: {len(parsed_records)}",
+        f"   - Complete records: {complete_records}",
+        f"   - Records with laycan dates: {laycan_records}",
+    ]))
 
 
 if __name__ == "__main__":
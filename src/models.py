@@ -3,11 +3,26 @@
 Data models and classes for shipping data parsing.
 """
 
+import sys
 from dataclasses import dataclass
 from typing import Dict, Union, Optional
 
+# Column names used as record dictionary keys. Interned so that lookups made
+# with these constants can match the stored keys by identity.
+COL_VESSEL_NAME = sys.intern("Vessel Name")
+COL_CARGO = sys.intern("Cargo")
+COL_QUANTITY_MT = sys.intern("Quantity (MT)")
+COL_LOAD_PORT = sys.intern("Load Port")
+COL_DISCHARGE_PORT = sys.intern("Discharge Port")
+COL_LAYCAN = sys.intern("Laycan")
+COL_LAYCAN_START_DATE = sys.intern("Laycan Start Date")
+COL_LAYCAN_END_DATE = sys.intern("Laycan End Date")
+COL_FREIGHT = sys.intern("Freight")
+COL_TOTAL_FREIGHT_USD = sys.intern("Total Freight (USD)")
+COL_CHARTERER = sys.intern("Charterer")
 
-@dataclass
+
+@dataclass(slots=True)
 class ShippingRecord:
     """Data class representing a parsed shipping record."""
 
@@ -26,17 +41,17 @@ class ShippingRecord:
     def to_dict(self) -> Dict:
         """Convert shipping record to dictionary format for DataFrame."""
         return {
-            "Vessel Name": self.vessel_name,
-            "Cargo": self.cargo,
-            "Quantity (MT)": self.quantity_mt,
-            "Load Port": self.load_port,
-            "Discharge Port": self.discharge_port,
-            "Laycan": self.laycan,
-            "Laycan Start Date": self.laycan_start_date,
-            "Laycan End Date": self.laycan_end_date,
-            "Freight": self.freight,
-            "Total Freight (USD)": self.total_freight_usd,
-            "Charterer": self.charterer,
+            COL_VESSEL_NAME: self.vessel_name,
+            COL_CARGO: self.cargo,
+            COL_QUANTITY_MT: self.quantity_mt,
+            COL_LOAD_PORT: self.load_port,
+            COL_DISCHARGE_PORT: self.discharge_port,
+            COL_LAYCAN: self.laycan,
+            COL_LAYCAN_START_DATE: self.laycan_start_date,
+            COL_LAYCAN_END_DATE: self.laycan_end_date,
+            COL_FREIGHT: self.freight,
+            COL_TOTAL_FREIGHT_USD: self.total_freight_usd,
+            COL_CHARTERER: self.charterer,
         }
 
     def is_complete(self) -> bool:
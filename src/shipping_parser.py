@@ -4,9 +4,13 @@ Core shipping data parser implementation.
 """
 
 import re
-import pandas as pd
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Union
+import sys
+from openpyxl import Workbook
+from calendar import monthrange
+from dataclasses import fields
+from datetime import date
+from operator import attrgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Union
 import logging
 
 from models import ShippingRecord
@@ -15,9 +19,137 @@ from config import AppConfig, ParserConfig
 logger = logging.getLogger(__name__)
 
 
+def _prefix_tree_pattern(words: Iterable[str]) -> str:
+    """Build a lowercase regex alternation of words with shared prefixes factored out.
+
+    At each position ``re`` tries alternation branches one by one, so factoring
+    out prefixes ("p(?:66|etroineos)") means one comparison per distinct
+    leading character rather than one per word. A word is preferred over any
+    shorter word that is its prefix, as in a longest-first alternation.
+    """
+    tree: Dict[str, dict] = {}
+    for word in words:
+        node = tree
+        for char in word.lower():
+            node = node.setdefault(char, {})
+        node[''] = {}  # end-of-word marker
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in node.items() if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Greedy optional group: the longer word is tried before the end marker
+        return f'(?:{body})?' if '' in node else body
+
+    return build(tree) or '(?!)'
+
+
 class ShippingDataParser:
     """Main parser for converting unstructured shipping data into structured records."""
 
+    # Fixed pattern tables, compiled once when the class is defined.
+    # Order matters: the first matching pattern wins.
+    # A leading case-insensitive character class makes the engine case-fold
+    # at every position it tries, so where a pattern starts with one its case
+    # variants are spelled out inside (?-i:...) instead.
+    # Where patterns are paired with a keyword, the pattern cannot match
+    # unless the lowercased text contains it; a substring test is much cheaper
+    # than a failed search. An empty keyword means always try the pattern.
+
+    # Status suffixes that interfere with parsing
+    _SUFFIX_PATTERNS = tuple((keyword, re.compile(p, re.IGNORECASE)) for keyword, p in (
+        ('failed', r'\s*-\s*Failed\s*$'), ('subs', r'\s*-\s*on\s+subs\s*$'),
+        ('rnr', r'\s+RNR\s*$'), ('bss', r'\s+bss\s+\w+\s*$'), ('/', r'\s+\d/\d\s*$'),
+        ('trip', r'\s+n\s+Trip\s+T/C.*$'), ('trip', r'\s+Trip\s+t/C.*$')
+    ))
+
+    # Laycan patterns - more comprehensive
+    _LAYCAN_PATTERNS = tuple((keyword, re.compile(p, re.IGNORECASE)) for keyword, p in (
+        ('', r'\d{1,2}\s+\w+\s*[–-]\s*\d{1,2}\s+\w+'),  # 25 Jun – 5 July
+        ('-', r'\d{1,2}-\d{1,2}\s+\w+'),  # 25-30 Jun, 4-10 July
+        ('ely', r'end\s+\w+\s*[–-]\s*ely\s+\w+'),  # end June – ely July
+        ('h', r'[12][Hh]\s+\w+'),  # 1H July, 2H June
+        ('ly', r'(?-i:[Ee])(?:ly|arly)\s+\w+'),  # Ely Jun, Early June
+        ('nd', r'(?-i:[Ee])nd\s+\w+'),  # end June
+        ('mid', r'mid\s+\w+'),  # mid Jul
+        ('dates', r'\w+\s+dates'),  # June dates
+        ('h', r'1\s+H\s+\w+'),  # 1 H Jul (with space)
+        ('-', r'\d{1,2}-\d{1,2}\s+\w+(?:uary|arch|pril|une|uly|ugust|eptember|ctober|ovember|ecember)'),
+        # More specific month matching
+    ))
+
+    # Freight patterns
+    _FREIGHT_PATTERNS = tuple((keyword, re.compile(p, re.IGNORECASE)) for keyword, p in (
+        ('lumpsum', r'USD\s+[\d,\.]+\s*M\s+Lumpsum'),  # USD 2.15M Lumpsum
+        ('us', r'(?-i:[YyUu]?[Uu][Ss][Dd]?)\s+(?:hi|lo|mid)\s+[\d,\.]+\s*M'),  # USd hi 2 M
+        ('us', r'(?-i:[YyUu]?[Uu][Ss][Dd]?)\s+[\d,\.]+\s*M'),  # Usd 2.85 M
+        ('pmt', r'(?-i:[YyUu]?[Uu][Ss][Dd]?)\s+[\d,\.]+\s+pmt'),  # Usd 35 pmt, YUsd 55 pmt
+        ('pd', r'(?-i:[YyUu]?[Uu][Ss][Dd]?)\s+[\d,\.]+\s*K\s+PD'),  # Usd 24K PD
+        ('ies', r'(?-i:[YyUu]?[Uu][Ss][Dd]?)\s+(?:low|hi|mid|miod|hih)\s+\d+ies'),  # With Usd prefix
+        ('ies', r'(?:low|hi|mid|miod|hih)\s+\d+ies'),  # Without Usd prefix
+        ('rnr', r'RNR')  # Rate not reported
+    ))
+
+    # Quantity patterns - more comprehensive to handle various formats
+    _QUANTITY_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+        r'(\d+-?\d*)\s*(?:ktons|ktrons|ktpns|Ktons|Mtons|MT)\b',  # With units
+        r'(\d+(?:,\d{3})*)\s+(?=[A-Z][a-z])',  # Plain numbers before cargo (like "8600 Benzene")
+    ))
+
+    # Laycan date patterns, paired with the name of the handler that turns
+    # the match into start/end dates (bound to the instance in __init__)
+    _LAYCAN_DATE_PATTERNS = tuple((re.compile(p, re.IGNORECASE), handler) for p, handler in (
+        # 25-30 Jun or 06-10 June
+        (r'(\d{1,2})-(\d{1,2})\s+(\w+)', '_parse_same_month_range'),
+        # 25 Jun – 5 July
+        (r'(\d{1,2})\s+(\w+)\s*[–-]\s*(\d{1,2})\s+(\w+)', '_parse_cross_month_range'),
+        # end June – ely July
+        (r'end\s+(\w+)\s*[–-]\s*ely\s+(\w+)', '_parse_end_to_early'),
+        # 1H July (first half)
+        (r'1\s*[Hh]\s+(\w+)', '_parse_first_half'),
+        # 2H June (second half)
+        (r'2[Hh]\s+(\w+)', '_parse_second_half'),
+        # Early/Ely June
+        (r'[Ee](?:ly|arly)\s+(\w+)', '_parse_early_month'),
+        # mid Jul
+        (r'mid\s+(\w+)', '_parse_mid_month'),
+        # end June
+        (r'[Ee]nd\s+(\w+)', '_parse_end_month'),
+        # June dates (vague)
+        (r'(\w+)\s+dates', '_parse_whole_month'),
+    ))
+
+    # Upper bound on cached laycan parses per parser
+    _LAYCAN_CACHE_SIZE = 1024
+
+    # Upper bound on cached line parses per parser, and the getter that
+    # snapshots a record's fields for the cache
+    _LINE_CACHE_SIZE = 4096
+    _RECORD_FIELDS = attrgetter(*(field.name for field in fields(ShippingRecord)))
+
+    # Freight fragments that can leak into port strings
+    _PORT_FREIGHT_PATTERNS = tuple((keyword, re.compile(p, re.IGNORECASE)) for keyword, p in (
+        ('us', r'[YU]?[Uu]sd?\s+[\d,\.]+'), ('rnr', r'RNR'), ('ies', r'(?:hi|lo|mid)\s+\d+ies')
+    ))
+
+    # Single-purpose patterns used while splitting a line into fields
+    _PARENTHESES_RE = re.compile(r'\([^)]*\)')
+    _PORT_SEPARATOR_RE = re.compile(r'\s+/\s+|\s+to\s+', re.IGNORECASE)
+    _TO_SEPARATOR_RE = re.compile(r'\s+to\s+', re.IGNORECASE)
+    _DELIVERY_RE = re.compile(r'\b(delivery|del|re-del)\b', re.IGNORECASE)
+    _MT_QUANTITY_CARGO_RE = re.compile(r'([\d,]+)\s*MT\s+(.*)', re.IGNORECASE)
+
+    # Freight calculation patterns (typo fixes are case-sensitive on purpose)
+    _USD_PREFIX_TYPO_RE = re.compile(r'^[YU]?[Uu]sd?')
+    _MIOD_TYPO_RE = re.compile(r'\bmiod\b')
+    _HIH_TYPO_RE = re.compile(r'\bhih\b')
+    _NUMBER_RE = re.compile(r'([\d\.]+)')
+    _MILLION_RE = re.compile(r'\b[\d\.]+\s*M\b', re.IGNORECASE)
+    _THOUSAND_RE = re.compile(r'\bK\b', re.IGNORECASE)
+    _IES_RANGE_RE = re.compile(r'(?:hi|lo|mid)\s+\d+ies', re.IGNORECASE)
+    _IES_VALUE_RE = re.compile(r'(\d+)ies')
+
     def __init__(self, app_config: AppConfig = None, parser_config: ParserConfig = None):
         """Initialize parser with configuration."""
         self.app_config = app_config or AppConfig()
@@ -27,54 +159,168 @@ class ShippingDataParser:
         self.months = {
             month: idx + 1 for idx, month in enumerate(self.parser_config.month_names)
         }
+        # Month spellings seen so far ("Jun", "June", "JUNE", ...), so repeat
+        # lookups skip the lower()/slice normalisation
+        self._month_lookup: Dict[str, int] = {}
+        self._laycan_cache: Dict[tuple, tuple] = {}
+        self._line_cache: Dict[str, tuple] = {}
+        # Messages logged while extracting the current line, cached with it
+        self._line_messages: List[tuple] = []
+
+        # Configuration-driven patterns, compiled here and again whenever
+        # the config lists they were built from change
+        self._charterers: Optional[List[str]] = None
+        self._cargo_patterns: Optional[List[str]] = None
+        self._refresh_patterns()
+
+        self._laycan_handlers = tuple(
+            (pattern, getattr(self, handler)) for pattern, handler in self._LAYCAN_DATE_PATTERNS
+        )
+
+    def _refresh_patterns(self) -> None:
+        """Recompile the configuration-driven patterns if their config lists changed.
+
+        ParserConfig.add_charterer() and add_cargo_pattern() may be called on
+        a config this parser already holds, so the patterns are compared
+        against a copy of the list they were built from. Comparing lists of
+        the same string objects is an identity check per item, cheap enough
+        to do for every line.
+        """
+        changed = False
+        if self.parser_config.charterers != self._charterers:
+            self._charterers = list(self.parser_config.charterers)
+            self._compile_charterer_patterns(self._charterers)
+            changed = True
+
+        if self.parser_config.cargo_patterns != self._cargo_patterns:
+            self._cargo_patterns = list(self.parser_config.cargo_patterns)
+            # Cargo patterns are only ever matched at the start of the text,
+            # where an alternation tries them in order, so one combined
+            # pattern gives the same first-listed-wins result as matching
+            # each in turn
+            cargo_alternation = '|'.join(f'(?:{p})' for p in self._cargo_patterns)
+            self._cargo_re = re.compile(cargo_alternation or '(?!)', re.IGNORECASE)
+            changed = True
+
+        if changed:
+            # Cached lines were extracted with the old patterns
+            self._line_cache.clear()
+
+    def _compile_charterer_patterns(self, charterers: List[str]) -> None:
+        """Compile the charterer search and charterer-led format patterns."""
+        # Longest name first, so that e.g. "SK Energy" wins over a shorter
+        # name sharing its prefix
+        by_length = sorted(charterers, key=len, reverse=True)
+        alternation = '|'.join(map(re.escape, by_length)) or '(?!)'
+        # Before a word character a leading \b just means "not preceded by a
+        # word character", and the lookbehind form searches markedly faster
+        if all(re.match(r'\w', charterer) for charterer in charterers):
+            leading_boundary = r'(?<!\w)'
+        else:
+            leading_boundary = r'\b'
+        self._charterer_re = re.compile(
+            leading_boundary + _prefix_tree_pattern(by_length) + r'\b', re.IGNORECASE
+        )
+        self._charterer_led_re = re.compile(rf'(?:{alternation}) /')
+        self._charterer_names = {}
+        for charterer in charterers:
+            self._charterer_names.setdefault(charterer.lower(), charterer)
 
     def parse_shipping_data(self, text_data: str) -> List[Dict]:
         """Parse shipping data text into structured records."""
-        if not text_data or not text_data.strip():
+        if not text_data or text_data.isspace():
             logger.warning("Empty input data provided")
             return []
 
-        records = []
-        lines = text_data.strip().split('\n')
-        failed_count = 0
+        return list(self.parse_stream(text_data.strip().split('\n')))
+
+    def parse_records(self, text_data: str) -> List[ShippingRecord]:
+        """Parse shipping data text into ShippingRecord objects."""
+        if not text_data or text_data.isspace():
+            logger.warning("Empty input data provided")
+            return []
+
+        return list(self._iter_records(text_data.strip().split('\n')))
+
+    def parse_stream(self, lines: Iterable[str]) -> Iterator[Dict]:
+        """Parse shipping data line by line, yielding records as they are produced.
+
+        Lines are consumed lazily, so parsing can overlap with reading when
+        ``lines`` is backed by a file or stdin.
+        """
+        return (record.to_dict() for record in self._iter_records(lines))
+
+    def _iter_records(self, lines: Iterable[str]) -> Iterator[ShippingRecord]:
+        """Parse lines lazily into ShippingRecord objects, logging failures."""
+        success_count = failed_count = total_lines = 0
 
         for line_number, line in enumerate(lines, 1):
             line = line.strip()
             if not line:
                 continue
+            total_lines += 1
 
+            # Only the failures a malformed line can cause are contained
+            # here; anything else is a bug and should surface
             try:
                 record = self._parse_line(line)
                 if record:
                     self._finalize_record(record)
-                    records.append(record.to_dict())
-                else:
-                    logger.warning(f"Line {line_number}: No record created")
-                    failed_count += 1
-            except Exception as e:
-                logger.error(f"Line {line_number}: Failed to parse - {e}")
+            except (ValueError, TypeError, AttributeError, IndexError, KeyError) as e:
+                logger.error("Line %d: Failed to parse - %s", line_number, e)
                 failed_count += 1
                 continue
 
-        success_count = len(records)
-        total_lines = len([l for l in lines if l.strip()])
-
-        logger.info(f"Parsed {success_count} records from {total_lines} lines "
-                    f"({failed_count} failed)")
+            if record:
+                success_count += 1
+                yield record
+            else:
+                logger.warning("Line %d: No record created", line_number)
+                failed_count += 1
 
-        return records
+        logger.info("Parsed %d records from %d lines (%d failed)",
+                    success_count, total_lines, failed_count)
 
     def _parse_line(self, line: str) -> Optional[ShippingRecord]:
         """Parse a single line of shipping data."""
+        self._refresh_patterns()
+
+        # Feeds repeat lines verbatim, and extraction depends only on the line
+        # and the configuration-driven patterns, whose recompilation clears
+        # the cache. Cache field values rather than records, since callers go
+        # on to fill in the returned record, along with the messages logged
+        # so a repeated line reports the same problems.
+        if (cached := self._line_cache.get(line)) is not None:
+            values, messages = cached
+            for level, msg, args in messages:
+                logger.log(level, msg, *args)
+            return ShippingRecord(*values)
+
+        self._line_messages = []
         if self._is_charterer_led_format(line):
-            return self._parse_charterer_format(line)
+            record = self._parse_charterer_format(line)
         else:
-            return self._parse_standard_format(line)
+            record = self._parse_standard_format(line)
+
+        # Cargo and port names come from a small vocabulary, so share one
+        # string object per name across records instead of one per line
+        record.cargo = sys.intern(record.cargo)
+        record.load_port = sys.intern(record.load_port)
+        record.discharge_port = sys.intern(record.discharge_port)
+
+        if len(self._line_cache) >= self._LINE_CACHE_SIZE:
+            self._line_cache.clear()
+        self._line_cache[line] = (self._RECORD_FIELDS(record), tuple(self._line_messages))
+        return record
+
+    def _log_line(self, level: int, msg: str, *args) -> None:
+        """Log a message about the line being extracted, keeping it for the line cache."""
+        self._line_messages.append((level, msg, args))
+        logger.log(level, msg, *args)
 
     def _is_charterer_led_format(self, line: str) -> bool:
         """Check if line follows charterer-led format (e.g., 'P66 / Vessel / Cargo')."""
-        return any(line.startswith(f"{charterer} /")
-                   for charterer in self.parser_config.charterers)
+        return self._charterer_led_re.match(line) is not None
 
     def _parse_charterer_format(self, line: str) -> ShippingRecord:
         """Parse charterer-led format: 'P66 / Vessel / Cargo / Ports / Dates / Freight'."""
@@ -113,90 +359,62 @@ class ShippingDataParser:
 
     def _clean_line_suffixes(self, line: str) -> str:
         """Remove common suffixes that interfere with parsing."""
-        suffixes = [
-            r'\s*-\s*Failed\s*$', r'\s*-\s*on\s+subs\s*$', r'\s+RNR\s*$',
-            r'\s+bss\s+\w+\s*$', r'\s+\d/\d\s*$', r'\s+n\s+Trip\s+T/C.*$',
-            r'\s+Trip\s+t/C.*$'
-        ]
-        for suffix in suffixes:
-            line = re.sub(suffix, '', line, flags=re.IGNORECASE)
+        # Most lines carry none of these suffixes; a substring test is far
+        # cheaper than letting each pattern scan the whole line. Removing a
+        # suffix only shortens the line, so checking the original is enough.
+        lowered = line.lower()
+        for keyword, suffix in self._SUFFIX_PATTERNS:
+            if keyword in lowered:
+                line = suffix.sub('', line)
         return line
 
     def _extract_charterer(self, line: str, record: ShippingRecord) -> str:
-        """Extract charterer from line and return cleaned line."""
-        for charterer in self.parser_config.charterers:
-            pattern = rf'\b{re.escape(charterer)}\b'
-            if re.search(pattern, line, re.IGNORECASE):
-                record.charterer = charterer
-                line = re.sub(pattern, '', line, flags=re.IGNORECASE).strip()
-                break
+        """Extract charterer from line and return cleaned line.
+
+        The charterer found earliest in the line wins, taking the longest
+        configured name at that position, and only that occurrence is
+        removed from the line.
+        """
+        if match := self._charterer_re.search(line):
+            record.charterer = self._charterer_names[match.group(0).lower()]
+            line = (line[:match.start()] + line[match.end():]).strip()
         return line
 
     def _extract_laycan_and_freight(self, text: str, record: ShippingRecord) -> str:
         """Extract laycan and freight information from text."""
         work_text = text
-
-        # Laycan patterns - more comprehensive
-        laycan_patterns = [
-            r'\d{1,2}\s+\w+\s*[–-]\s*\d{1,2}\s+\w+',  # 25 Jun – 5 July
-            r'\d{1,2}-\d{1,2}\s+\w+',  # 25-30 Jun, 4-10 July
-            r'end\s+\w+\s*[–-]\s*ely\s+\w+',  # end June – ely July
-            r'[12][Hh]\s+\w+',  # 1H July, 2H June
-            r'[Ee](?:ly|arly)\s+\w+',  # Ely Jun, Early June
-            r'[Ee]nd\s+\w+',  # end June
-            r'mid\s+\w+',  # mid Jul
-            r'\w+\s+dates',  # June dates
-            r'1\s+H\s+\w+',  # 1 H Jul (with space)
-            r'\d{1,2}-\d{1,2}\s+\w+(?:uary|arch|pril|une|uly|ugust|eptember|ctober|ovember|ecember)',
-            # More specific month matching
-        ]
+        lowered = text.lower()
 
         # Try to find laycan pattern
-        for pattern in laycan_patterns:
-            if match := re.search(pattern, work_text, re.IGNORECASE):
+        for keyword, pattern in self._LAYCAN_PATTERNS:
+            if keyword in lowered and (match := pattern.search(work_text)):
                 record.laycan = match.group(0).strip()
-                work_text = work_text.replace(match.group(0), '').strip()
+                work_text = (work_text[:match.start()] + work_text[match.end():]).strip()
+                # Joining the text around the cut can form new substrings
+                lowered = work_text.lower()
                 break
 
-        # Freight patterns
-        freight_patterns = [
-            r'USD\s+[\d,\.]+\s*M\s+Lumpsum',  # USD 2.15M Lumpsum
-            r'[YU]?[Uu]sd?\s+(?:hi|lo|mid)\s+[\d,\.]+\s*M',  # USd hi 2 M
-            r'[YU]?[Uu]sd?\s+[\d,\.]+\s*M',  # Usd 2.85 M
-            r'[YU]?[Uu]sd?\s+[\d,\.]+\s+pmt',  # Usd 35 pmt, YUsd 55 pmt
-            r'[YU]?[Uu]sd?\s+[\d,\.]+\s*K\s+PD',  # Usd 24K PD
-            r'[YU]?[Uu]sd?\s+(?:low|hi|mid|miod|hih)\s+\d+ies',  # With Usd prefix
-            r'(?:low|hi|mid|miod|hih)\s+\d+ies',  # Without Usd prefix
-            r'RNR'  # Rate not reported
-        ]
-
         # Try to find freight pattern
-        for pattern in freight_patterns:
-            if match := re.search(pattern, work_text, re.IGNORECASE):
+        for keyword, pattern in self._FREIGHT_PATTERNS:
+            if keyword in lowered and (match := pattern.search(work_text)):
                 record.freight = match.group(0).strip()
-                work_text = work_text.replace(match.group(0), '').strip()
+                work_text = (work_text[:match.start()] + work_text[match.end():]).strip()
                 break
 
         return work_text
 
     def _extract_vessel_cargo_ports(self, text: str, record: ShippingRecord):
         """Extract vessel name, quantity, cargo, and ports from text."""
-        # Quantity patterns - more comprehensive to handle various formats
-        qty_patterns = [
-            r'(\d+-?\d*)\s*(?:ktons|ktrons|ktpns|Ktons|Mtons|MT)\b',  # With units
-            r'(\d+(?:,\d{3})*)\s+(?=[A-Z][a-z])',  # Plain numbers before cargo (like "8600 Benzene")
-        ]
-
         qty_match = None
-        for pattern in qty_patterns:
-            if match := re.search(pattern, text, re.IGNORECASE):
+        for pattern in self._QUANTITY_PATTERNS:
+            if match := pattern.search(text):
                 qty_match = match
                 break
 
         if qty_match:
             # Extract vessel name (everything before quantity)
             vessel_part = text[:qty_match.start()].strip()
-            vessel_part = re.sub(r'\([^)]*\)', '', vessel_part).strip()  # Remove parentheses
+            vessel_part = self._PARENTHESES_RE.sub('', vessel_part).strip()  # Remove parentheses
             if vessel_part:
                 record.vessel_name = vessel_part
 
@@ -214,13 +432,13 @@ class ShippingDataParser:
                     qty_value *= 1000
                 record.quantity_mt = qty_value
             except ValueError:
-                logger.warning(f"Could not parse quantity: {qty_str}")
+                self._log_line(logging.WARNING, "Could not parse quantity: %s", qty_str)
 
             # Extract cargo and ports from remaining text
             remaining = text[qty_match.end():].strip()
             self._extract_cargo_and_ports(remaining, record)
         else:
-            logger.debug(f"No quantity pattern found in: {text}")
+            self._log_line(logging.DEBUG, "No quantity pattern found in: %s", text)
             # If no quantity found, try to extract cargo and ports from full text
             self._extract_cargo_and_ports(text, record)
 
@@ -230,18 +448,12 @@ class ShippingDataParser:
             return
 
         # Try to match cargo patterns first
-        cargo_match = None
-        for pattern in self.parser_config.cargo_patterns:
-            if match := re.match(pattern, text, re.IGNORECASE):
-                cargo_match = match
-                break
-
-        if cargo_match:
+        if cargo_match := self._cargo_re.match(text):
             record.cargo = cargo_match.group(0).strip()
             ports_text = text[cargo_match.end():].strip()
         else:
             # Look for port separators to determine where cargo ends
-            if port_sep := re.search(r'\s+/\s+|\s+to\s+', text, re.IGNORECASE):
+            if port_sep := self._PORT_SEPARATOR_RE.search(text):
                 # Extract cargo part before port separator
                 cargo_part = text[:port_sep.start()].strip()
                 # For unknown cargo types, be conservative - take only first word if it looks like a cargo name
@@ -269,12 +481,12 @@ class ShippingDataParser:
 
     def _extract_quantity_cargo_from_string(self, text: str, record: ShippingRecord):
         """Extract quantity and cargo from charterer format string."""
-        if match := re.search(r'([\d,]+)\s*MT\s+(.*)', text, re.IGNORECASE):
+        if match := self._MT_QUANTITY_CARGO_RE.search(text):
             qty_str = match.group(1).replace(',', '')
             try:
                 record.quantity_mt = float(qty_str)
             except ValueError:
-                logger.warning(f"Could not parse quantity: {qty_str}")
+                self._log_line(logging.WARNING, "Could not parse quantity: %s", qty_str)
             record.cargo = match.group(2).strip()
 
     def _extract_ports_from_string(self, ports_str: str, record: ShippingRecord):
@@ -283,18 +495,19 @@ class ShippingDataParser:
             return
 
         # Skip delivery/redelivery instructions
-        if re.search(r'\b(delivery|del|re-del)\b', ports_str, re.IGNORECASE):
+        if self._DELIVERY_RE.search(ports_str):
             return
 
         # Clean freight information that might have leaked in
-        for pattern in [r'[YU]?[Uu]sd?\s+[\d,\.]+', r'RNR', r'(?:hi|lo|mid)\s+\d+ies']:
-            ports_str = re.sub(pattern, '', ports_str, flags=re.IGNORECASE).strip()
+        for keyword, pattern in self._PORT_FREIGHT_PATTERNS:
+            if keyword in ports_str.lower():
+                ports_str = pattern.sub('', ports_str).strip()
 
         # Extract ports based on separators
         if ' / ' in ports_str:
             parts = ports_str.split(' / ', 1)
             record.load_port, record.discharge_port = parts[0].strip(), parts[1].strip()
-        elif to_match := re.search(r'\s+to\s+', ports_str, re.IGNORECASE):
+        elif to_match := self._TO_SEPARATOR_RE.search(ports_str):
             record.load_port = ports_str[:to_match.start()].strip()
             record.discharge_port = ports_str[to_match.end():].strip()
 
@@ -312,46 +525,37 @@ class ShippingDataParser:
 
     def _parse_laycan(self, laycan_str: str) -> Dict[str, Optional[str]]:
         """Parse laycan string into start and end dates."""
+        # The same few laycan strings recur throughout a report, so results
+        # are cached per parser. The year is part of the key because callers
+        # may change it on the config after the parser is built.
+        key = (laycan_str, self.app_config.default_year)
+        if (cached := self._laycan_cache.get(key)) is not None:
+            return {"start": cached[0], "end": cached[1]}
+
+        dates = {"start": None, "end": None}
         try:
-            # Various laycan patterns
-            patterns = [
-                # 25-30 Jun or 06-10 June
-                (r'(\d{1,2})-(\d{1,2})\s+(\w+)', self._parse_same_month_range),
-                # 25 Jun – 5 July
-                (r'(\d{1,2})\s+(\w+)\s*[–-]\s*(\d{1,2})\s+(\w+)', self._parse_cross_month_range),
-                # end June – ely July
-                (r'end\s+(\w+)\s*[–-]\s*ely\s+(\w+)', self._parse_end_to_early),
-                # 1H July (first half)
-                (r'1\s*[Hh]\s+(\w+)', self._parse_first_half),
-                # 2H June (second half)
-                (r'2[Hh]\s+(\w+)', self._parse_second_half),
-                # Early/Ely June
-                (r'[Ee](?:ly|arly)\s+(\w+)', self._parse_early_month),
-                # mid Jul
-                (r'mid\s+(\w+)', self._parse_mid_month),
-                # end June
-                (r'[Ee]nd\s+(\w+)', self._parse_end_month),
-                # June dates (vague)
-                (r'(\w+)\s+dates', self._parse_whole_month),
-            ]
-
-            for pattern, handler in patterns:
-                if match := re.match(pattern, laycan_str, re.IGNORECASE):
-                    return handler(match)
-
+            for pattern, handler in self._laycan_handlers:
+                if match := pattern.match(laycan_str):
+                    dates = handler(match)
+                    break
         except Exception as e:
-            logger.warning(f"Failed to parse laycan '{laycan_str}': {e}")
+            logger.warning("Failed to parse laycan '%s': %s", laycan_str, e)
+            return dates
 
-        return {"start": None, "end": None}
+        if len(self._laycan_cache) >= self._LAYCAN_CACHE_SIZE:
+            self._laycan_cache.clear()
+        self._laycan_cache[key] = (dates["start"], dates["end"])
+        return dates
 
     def _parse_same_month_range(self, match) -> Dict[str, Optional[str]]:
         """Parse date range within same month."""
         day1, day2, month_str = match.groups()
         month = self._get_month_number(month_str)
         if month:
-            start = datetime(self.app_config.default_year, month, int(day1))
-            end = datetime(self.app_config.default_year, month, int(day2))
-            return {"start": start.strftime('%Y-%m-%d'), "end": end.strftime('%Y-%m-%d')}
+            year = self.app_config.default_year
+            start = date(year, month, int(day1))
+            end = date(year, month, int(day2))
+            return {"start": start.isoformat(), "end": end.isoformat()}
         return {"start": None, "end": None}
 
     def _parse_cross_month_range(self, match) -> Dict[str, Optional[str]]:
@@ -359,10 +563,11 @@ class ShippingDataParser:
         day1, month1_str, day2, month2_str = match.groups()
         month1, month2 = self._get_month_number(month1_str), self._get_month_number(month2_str)
         if month1 and month2:
-            year2 = self.app_config.default_year if month2 >= month1 else self.app_config.default_year + 1
-            start = datetime(self.app_config.default_year, month1, int(day1))
-            end = datetime(year2, month2, int(day2))
-            return {"start": start.strftime('%Y-%m-%d'), "end": end.strftime('%Y-%m-%d')}
+            year = self.app_config.default_year
+            year2 = year if month2 >= month1 else year + 1
+            start = date(year, month1, int(day1))
+            end = date(year2, month2, int(day2))
+            return {"start": start.isoformat(), "end": end.isoformat()}
         return {"start": None, "end": None}
 
     def _parse_end_to_early(self, match) -> Dict[str, Optional[str]]:
@@ -370,78 +575,81 @@ class ShippingDataParser:
         month1_str, month2_str = match.groups()
         month1, month2 = self._get_month_number(month1_str), self._get_month_number(month2_str)
         if month1 and month2:
-            year2 = self.app_config.default_year if month2 >= month1 else self.app_config.default_year + 1
-            start = datetime(self.app_config.default_year, month1, 24)
-            end = datetime(year2, month2, 10)
-            return {"start": start.strftime('%Y-%m-%d'), "end": end.strftime('%Y-%m-%d')}
+            year = self.app_config.default_year
+            year2 = year if month2 >= month1 else year + 1
+            start = date(year, month1, 24)
+            end = date(year2, month2, 10)
+            return {"start": start.isoformat(), "end": end.isoformat()}
         return {"start": None, "end": None}
 
     def _parse_first_half(self, match) -> Dict[str, Optional[str]]:
         """Parse first half of month (1H July)."""
         month = self._get_month_number(match.group(1))
         if month:
-            start = datetime(self.app_config.default_year, month, 1)
-            end = datetime(self.app_config.default_year, month, 15)
-            return {"start": start.strftime('%Y-%m-%d'), "end": end.strftime('%Y-%m-%d')}
+            year = self.app_config.default_year
+            start = date(year, month, 1)
+            end = date(year, month, 15)
+            return {"start": start.isoformat(), "end": end.isoformat()}
         return {"start": None, "end": None}
 
     def _parse_second_half(self, match) -> Dict[str, Optional[str]]:
         """Parse second half of month (2H June)."""
         month = self._get_month_number(match.group(1))
         if month:
-            start = datetime(self.app_config.default_year, month, 16)
-            if month == 12:
-                end = datetime(self.app_config.default_year, 12, 31)
-            else:
-                end = datetime(self.app_config.default_year, month + 1, 1) - timedelta(days=1)
-            return {"start": start.strftime('%Y-%m-%d'), "end": end.strftime('%Y-%m-%d')}
+            year = self.app_config.default_year
+            start = date(year, month, 16)
+            end = date(year, month, monthrange(year, month)[1])
+            return {"start": start.isoformat(), "end": end.isoformat()}
         return {"start": None, "end": None}
 
     def _parse_early_month(self, match) -> Dict[str, Optional[str]]:
         """Parse early month (Early June)."""
         month = self._get_month_number(match.group(1))
         if month:
-            start = datetime(self.app_config.default_year, month, 1)
-            end = datetime(self.app_config.default_year, month, 10)
-            return {"start": start.strftime('%Y-%m-%d'), "end": end.strftime('%Y-%m-%d')}
+            year = self.app_config.default_year
+            start = date(year, month, 1)
+            end = date(year, month, 10)
+            return {"start": start.isoformat(), "end": end.isoformat()}
         return {"start": None, "end": None}
 
     def _parse_mid_month(self, match) -> Dict[str, Optional[str]]:
         """Parse middle of month (mid Jul)."""
         month = self._get_month_number(match.group(1))
         if month:
-            start = datetime(self.app_config.default_year, month, 11)
-            end = datetime(self.app_config.default_year, month, 20)
-            return {"start": start.strftime('%Y-%m-%d'), "end": end.strftime('%Y-%m-%d')}
+            year = self.app_config.default_year
+            start = date(year, month, 11)
+            end = date(year, month, 20)
+            return {"start": start.isoformat(), "end": end.isoformat()}
         return {"start": None, "end": None}
 
     def _parse_end_month(self, match) -> Dict[str, Optional[str]]:
         """Parse end of month (end June)."""
         month = self._get_month_number(match.group(1))
         if month:
-            start = datetime(self.app_config.default_year, month, 24)
-            if month == 12:
-                end = datetime(self.app_config.default_year, 12, 31)
-            else:
-                end = datetime(self.app_config.default_year, month + 1, 1) - timedelta(days=1)
-            return {"start": start.strftime('%Y-%m-%d'), "end": end.strftime('%Y-%m-%d')}
+            year = self.app_config.default_year
+            start = date(year, month, 24)
+            end = date(year, month, monthrange(year, month)[1])
+            return {"start": start.isoformat(), "end": end.isoformat()}
         return {"start": None, "end": None}
 
     def _parse_whole_month(self, match) -> Dict[str, Optional[str]]:
         """Parse whole month (June dates)."""
         month = self._get_month_number(match.group(1))
         if month:
-            start = datetime(self.app_config.default_year, month, 1)
-            if month == 12:
-                end = datetime(self.app_config.default_year, 12, 31)
-            else:
-                end = datetime(self.app_config.default_year, month + 1, 1) - timedelta(days=1)
-            return {"start": start.strftime('%Y-%m-%d'), "end": end.strftime('%Y-%m-%d')}
+            year = self.app_config.default_year
+            start = date(year, month, 1)
+            end = date(year, month, monthrange(year, month)[1])
+            return {"start": start.isoformat(), "end": end.isoformat()}
         return {"start": None, "end": None}
 
     def _get_month_number(self, month_str: str) -> Optional[int]:
         """Convert month string to number."""
-        return self.months.get(month_str.lower()[:3])
+        month = self._month_lookup.get(month_str)
+        if month is None:
+            month = self.months.get(month_str.lower()[:3])
+            if month is not None:
+                self._month_lookup[month_str] = month
+        return month
 
     def _calculate_freight(self, freight_str: str, quantity: float) -> Union[float, str]:
         """Calculate total freight from freight string and quantity."""
@@ -452,33 +660,36 @@ class ShippingDataParser:
             # Clean typos if typo correction is enabled
             original_freight = freight_str
             if self.app_config.enable_typo_correction:
-                freight_str = re.sub(r'^[YU]?[Uu]sd?', 'USD', freight_str)  # Fix YUsd, USd
-                freight_str = re.sub(r'\bmiod\b', 'mid', freight_str)  # Fix miod
-                freight_str = re.sub(r'\bhih\b', 'hi', freight_str)  # Fix hih
+                freight_str = self._USD_PREFIX_TYPO_RE.sub('USD', freight_str)  # Fix YUsd, USd
+                if 'miod' in freight_str:
+                    freight_str = self._MIOD_TYPO_RE.sub('mid', freight_str)  # Fix miod
+                if 'hih' in freight_str:
+                    freight_str = self._HIH_TYPO_RE.sub('hi', freight_str)  # Fix hih
 
             freight_str = freight_str.replace(',', '')
+            lowered = freight_str.lower()
 
             # Per metric ton rates
-            if 'pmt' in freight_str.lower():
-                if match := re.search(r'([\d\.]+)', freight_str):
+            if 'pmt' in lowered:
+                if match := self._NUMBER_RE.search(freight_str):
                     return float(match.group(1)) * quantity
 
             # Million dollar amounts (including Lumpsum)
-            elif re.search(r'\b[\d\.]+\s*M\b', freight_str, re.IGNORECASE):
-                if match := re.search(r'([\d\.]+)', freight_str):
+            elif self._MILLION_RE.search(freight_str):
+                if match := self._NUMBER_RE.search(freight_str):
                     return float(match.group(1)) * 1_000_000
 
             # Thousand dollar amounts
-            elif re.search(r'\bK\b', freight_str, re.IGNORECASE):
-                if match := re.search(r'([\d\.]+)', freight_str):
+            elif self._THOUSAND_RE.search(freight_str):
+                if match := self._NUMBER_RE.search(freight_str):
                     return float(match.group(1)) * 1_000
 
             # Range estimates (e.g., "hi 40ies", "lo 90ies")
-            elif re.search(r'(?:hi|lo|mid)\s+\d+ies', freight_str, re.IGNORECASE):
-                if match := re.search(r'(\d+)ies', freight_str):
+            elif self._IES_RANGE_RE.search(freight_str):
+                if match := self._IES_VALUE_RE.search(freight_str):
                     base_value = float(match.group(1))
                     # For "low" estimates in high numbers (like "lo 90ies"), treat as thousands
-                    if 'lo' in freight_str.lower() and base_value > 50:
+                    if 'lo' in lowered and base_value > 50:
                         return base_value * 1_000
                     # For smaller values or "hi/mid", multiply by quantity (per ton rate)
                     elif base_value < 200:
@@ -488,7 +699,7 @@ class ShippingDataParser:
                         return base_value * 1_000
 
         except Exception as e:
-            logger.warning(f"Failed to calculate freight for '{original_freight}': {e}")
+            logger.warning("Failed to calculate freight for '%s': %s", original_freight, e)
 
         return "N/A"
 
@@ -499,12 +710,21 @@ class ShippingDataParser:
             return False
 
         try:
-            df = pd.DataFrame(records)
-            df.to_excel(filename, index=False, engine='openpyxl')
-            logger.info(f"Saved {len(records)} records to {filename}")
+            # Write-only mode streams rows to the file instead of keeping a
+            # cell object for every value in memory
+            workbook = Workbook(write_only=True)
+            sheet = workbook.create_sheet("Sheet1")
+
+            headers = list(records[0])
+            sheet.append(headers)
+            for record in records:
+                sheet.append([record.get(header) for header in headers])
+
+            workbook.save(filename)
+            logger.info("Saved %d records to %s", len(records), filename)
             return True
         except Exception as e:
-            logger.error(f"Failed to save to Excel: {e}")
+            logger.error("Failed to save to Excel: %s", e)
             return False
 
     def get_parser_statistics(self) -> Dict:
@@ -3,19 +3,36 @@
 Unit tests for CLI components.
 """
 
+import io
+import os
 import unittest
 from unittest.mock import Mock, patch
 import tempfile
 from pathlib import Path
+import pandas as pd
 
 from config import AppConfig, ParserConfig
 from cli import (
-    StdinDataReader, FileDataReader, ExcelDataWriter,
+    StreamingDataReader, StdinDataReader, FileDataReader, ExcelDataWriter, CsvDataWriter,
     ShippingDataProcessor, ShippingDataCLI, CLIFactory,
-    create_argument_parser, main
+    create_argument_parser, main, _get_parser
 )
 
 
+class _FailingStream(io.RawIOBase):
+    """Readable binary stream whose reads raise the given exception."""
+
+    def __init__(self, exc: BaseException):
+        super().__init__()
+        self.exc = exc
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        raise self.exc
+
+
 class TestDataReaders(unittest.TestCase):
     """Test data input classes."""
 
@@ -34,6 +51,67 @@ class TestDataReaders(unittest.TestCase):
         finally:
             Path(temp_path).unlink()
 
+    def test_file_data_reader_empty_file(self):
+        """Test reading an empty file returns an empty string."""
+        with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
+            temp_path = f.name
+
+        try:
+            reader = FileDataReader(temp_path)
+            self.assertEqual(reader.read_data(), "")
+        finally:
+            Path(temp_path).unlink()
+
+    def test_file_data_reader_utf8_content(self):
+        """Test reading a file with multi-byte UTF-8 characters."""
+        test_content = "Golden Violet 18ktons Palm oil / WC India – Pakistan\n"
+
+        with tempfile.NamedTemporaryFile(mode='w', encoding='utf-8', delete=False) as f:
+            f.write(test_content)
+            temp_path = f.name
+
+        try:
+            reader = FileDataReader(temp_path)
+            self.assertEqual(reader.read_data(), test_content)
+        finally:
+            Path(temp_path).unlink()
+
+    def test_file_data_reader_translates_newlines(self):
+        """Test \\r\\n and lone \\r line endings are read as \\n."""
+        with tempfile.NamedTemporaryFile(mode='wb', delete=False) as f:
+            f.write(b"first\r\nsecond\rthird\n")
+            temp_path = f.name
+
+        try:
+            reader = FileDataReader(temp_path)
+            self.assertEqual(reader.read_data(), "first\nsecond\nthird\n")
+        finally:
+            Path(temp_path).unlink()
+
+    @unittest.skipUnless(Path('/dev/fd').is_dir(), "requires /dev/fd")
+    def test_file_data_reader_pipe(self):
+        """Test reading from a pipe, as with `-i <(command)`."""
+        read_fd, write_fd = os.pipe()
+        self.addCleanup(os.close, read_fd)
+        with os.fdopen(write_fd, 'w', encoding='utf-8') as writer:
+            writer.write("hello ✓\n")
+
+        reader = FileDataReader(f'/dev/fd/{read_fd}')
+
+        self.assertEqual(reader.read_data(), "hello ✓\n")
+
+    def test_file_data_reader_iter_lines(self):
+        """Test file lines are yielded without reading the whole file."""
+        with tempfile.NamedTemporaryFile(mode='w', encoding='utf-8', delete=False) as f:
+            f.write("first line\nsecond line\n")
+            temp_path = f.name
+
+        try:
+            reader = FileDataReader(temp_path)
+            self.assertEqual(list(reader.iter_lines()), ["first line\n", "second line\n"])
+        finally:
+            Path(temp_path).unlink()
+
     def test_file_data_reader_missing_file(self):
         """Test reading non-existent file raises appropriate error."""
         reader = FileDataReader("nonexistent_file.txt")
@@ -66,24 +144,47 @@ class TestDataReaders(unittest.TestCase):
                 Path(temp_path).chmod(0o644)
             Path(temp_path).unlink(missing_ok=True)
 
-    @patch('sys.stdin')
-    def test_stdin_data_reader_success(self, mock_stdin):
+    @staticmethod
+    def _stdin(data: bytes, encoding: str = 'utf-8') -> io.TextIOWrapper:
+        """Build a stand-in for sys.stdin over the given bytes."""
+        return io.TextIOWrapper(io.BytesIO(data), encoding=encoding, newline='\n')
+
+    def test_stdin_data_reader_success(self):
         """Test successful stdin reading."""
-        test_data = "pasted shipping data"
-        mock_stdin.read.return_value = test_data
+        with patch('sys.stdin', self._stdin(b"pasted shipping data")):
+            result = StdinDataReader("Test prompt").read_data()
+
+        self.assertEqual(result, "pasted shipping data")
+
+    def test_stdin_data_reader_text_mode(self):
+        """Test stdin is decoded with its own encoding and newlines are translated."""
+        data = "Café 1\r\nCafé 2\rCafé 3\n".encode('cp1252')
+
+        with patch('sys.stdin', self._stdin(data, encoding='cp1252')):
+            result = StdinDataReader().read_data()
+
+        self.assertEqual(result, "Café 1\nCafé 2\nCafé 3\n")
 
-        reader = StdinDataReader("Test prompt")
-        result = reader.read_data()
+    def test_stdin_data_reader_iter_lines(self):
+        """Test stdin lines are yielded one at a time."""
+        with patch('sys.stdin', self._stdin("line one\r\nline two ✓\n".encode('utf-8'))):
+            lines = list(StdinDataReader().iter_lines())
 
-        self.assertEqual(result, test_data)
-        mock_stdin.read.assert_called_once()
+        self.assertEqual(lines, ["line one\n", "line two ✓\n"])
+
+    def test_stdin_data_reader_whitespace_only(self):
+        """Test whitespace-only stdin input is returned as read."""
+        with patch('sys.stdin', self._stdin(b"  \n\t\n")):
+            self.assertEqual(StdinDataReader().read_data(), "  \n\t\n")
 
     @patch('sys.stdin')
     @patch('sys.exit')
     @patch('builtins.print')
     def test_stdin_data_reader_keyboard_interrupt(self, mock_print, mock_exit, mock_stdin):
         """Test handling keyboard interrupt gracefully."""
-        mock_stdin.read.side_effect = KeyboardInterrupt()
+        mock_stdin.encoding = 'utf-8'
+        mock_stdin.errors = 'strict'
+        mock_stdin.buffer = _FailingStream(KeyboardInterrupt())
 
         reader = StdinDataReader()
         reader.read_data()
@@ -95,7 +196,9 @@ class TestDataReaders(unittest.TestCase):
     @patch('sys.stdin')
     def test_stdin_data_reader_runtime_error(self, mock_stdin):
         """Test handling of runtime errors during stdin reading."""
-        mock_stdin.read.side_effect = IOError("Stdin error")
+        mock_stdin.encoding = 'utf-8'
+        mock_stdin.errors = 'strict'
+        mock_stdin.buffer = _FailingStream(IOError("Stdin error"))
 
         reader = StdinDataReader()
 
@@ -139,6 +242,34 @@ class TestDataWriters(unittest.TestCase):
 
         self.assertFalse(result)
 
+    def test_csv_writer_success(self):
+        """Test CSV writing keeps column order and values."""
+        writer = CsvDataWriter()
+        records = [
+            {'Vessel Name': 'Ship1', 'Quantity (MT)': 1000.0, 'Laycan Start Date': None},
+            {'Vessel Name': 'Ship2', 'Quantity (MT)': 'N/A', 'Laycan Start Date': '2024-06-25'},
+        ]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_file = Path(temp_dir) / "output.csv"
+
+            self.assertTrue(writer.write_data(records, str(output_file)))
+
+            df = pd.read_csv(output_file)
+            self.assertEqual(list(df.columns), ['Vessel Name', 'Quantity (MT)', 'Laycan Start Date'])
+            self.assertEqual(df['Vessel Name'].tolist(), ['Ship1', 'Ship2'])
+            self.assertEqual(df.iloc[1]['Laycan Start Date'], '2024-06-25')
+
+    def test_csv_writer_empty_records(self):
+        """Test CSV writing with no records."""
+        self.assertFalse(CsvDataWriter().write_data([], "test.csv"))
+
+    def test_csv_writer_failure(self):
+        """Test CSV writing to an unwritable path."""
+        records = [{'Vessel Name': 'Ship1'}]
+
+        self.assertFalse(CsvDataWriter().write_data(records, "/nonexistent/dir/out.csv"))
+
 
 class TestShippingDataProcessor(unittest.TestCase):
     """Test the core business logic processor."""
@@ -180,6 +311,27 @@ class TestShippingDataProcessor(unittest.TestCase):
 
         self.assertIn("No valid records", str(cm.exception))
 
+    def test_process_stream_success(self):
+        """Test processing a stream of lines through the parser."""
+        lines = iter(["line one\n", "line two\n"])
+        expected_records = [{'Vessel Name': 'Test Vessel', 'Cargo': 'Test Cargo'}]
+
+        self.mock_parser.parse_stream.return_value = iter(expected_records)
+
+        result = self.processor.process_stream(lines)
+
+        self.assertEqual(result, expected_records)
+        self.mock_parser.parse_stream.assert_called_once_with(lines)
+
+    def test_process_stream_no_records_parsed(self):
+        """Test processing a stream that yields no records."""
+        self.mock_parser.parse_stream.return_value = iter([])
+
+        with self.assertRaises(ValueError) as cm:
+            self.processor.process_stream(iter(["invalid data\n"]))
+
+        self.assertIn("No valid records", str(cm.exception))
+
     def test_get_summary_comprehensive(self):
         """Test comprehensive summary generation."""
         test_records = [
@@ -368,11 +520,70 @@ class TestShippingDataCLI(unittest.TestCase):
 
         mock_exit.assert_called_once_with(3)  # Runtime error
 
+    @patch('builtins.print')
+    def test_run_streams_lines_when_reader_supports_it(self, mock_print):
+        """Test readers with iter_lines() are parsed as they are read."""
+        test_records = [{'Vessel Name': 'Test', 'Cargo': 'Test Cargo'}]
+        reader = Mock(spec=StreamingDataReader)
+        reader.iter_lines.return_value = iter(["\n", "line one\n", "line two\n"])
+        self.mock_processor.process_stream.return_value = test_records
+        self.mock_writer.write_data.return_value = True
+        self.mock_processor.get_summary.return_value = {
+            'total_records': 1, 'complete_records': 1, 'laycan_records': 0,
+            'freight_records': 0, 'completion_rate': 1.0
+        }
+        cli = ShippingDataCLI(self.config, reader, self.mock_writer, self.mock_processor)
+
+        cli.run()
+
+        reader.read_data.assert_not_called()
+        self.mock_processor.process_data.assert_not_called()
+        (lines,), _ = self.mock_processor.process_stream.call_args
+        self.assertEqual(list(lines), ["line one\n", "line two\n"])
+        self.mock_writer.write_data.assert_called_once_with(test_records, "test_output.xlsx")
+
+    @patch('builtins.print')
+    @patch('sys.exit')
+    def test_run_streaming_empty_input(self, mock_exit, mock_print):
+        """Test streamed input with only blank lines is a validation error."""
+        reader = Mock(spec=StreamingDataReader)
+        reader.iter_lines.return_value = iter(["\n", "   \n"])
+        cli = ShippingDataCLI(self.config, reader, self.mock_writer, self.mock_processor)
+
+        cli.run()
+
+        mock_exit.assert_called_once_with(1)
+        self.mock_processor.process_stream.assert_not_called()
+
+    @patch('builtins.print')
+    @patch('sys.exit')
+    def test_run_streaming_read_error(self, mock_exit, mock_print):
+        """Test undecodable streamed input is reported as a runtime error."""
+        with tempfile.NamedTemporaryFile(mode='wb', delete=False) as f:
+            f.write(b"line one\n\xff\xfe bad bytes\n")
+            temp_path = f.name
+
+        try:
+            processor = ShippingDataProcessor(Mock())
+            processor.parser.parse_stream.side_effect = lambda lines: iter(list(lines))
+            cli = ShippingDataCLI(self.config, FileDataReader(temp_path), self.mock_writer, processor)
+
+            cli.run()
+
+            mock_exit.assert_called_once_with(3)
+        finally:
+            Path(temp_path).unlink()
+
 
 class TestCLIFactory(unittest.TestCase):
     """Test the CLI factory class."""
 
-    @patch('cli.ShippingDataParser')
+    def setUp(self):
+        """Start each test with an empty parser cache."""
+        _get_parser.cache_clear()
+        self.addCleanup(_get_parser.cache_clear)
+
+    @patch('shipping_parser.ShippingDataParser')
     def test_create_stdin_cli(self, mock_parser_class):
         """Test creating stdin CLI with default configuration."""
         mock_parser = Mock()
@@ -388,7 +599,7 @@ class TestCLIFactory(unittest.TestCase):
         # Verify parser was created with correct configuration
         mock_parser_class.assert_called_once()
 
-    @patch('cli.ShippingDataParser')
+    @patch('shipping_parser.ShippingDataParser')
     def test_create_stdin_cli_custom_config(self, mock_parser_class):
         """Test creating stdin CLI with custom configuration."""
         mock_parser = Mock()
@@ -402,7 +613,21 @@ class TestCLIFactory(unittest.TestCase):
         self.assertEqual(cli.config.output_filename, "custom.xlsx")
         self.assertEqual(cli.config.default_year, 2023)
 
-    @patch('cli.ShippingDataParser')
+    @patch('shipping_parser.ShippingDataParser')
+    def test_factories_reuse_parser_for_equal_configs(self, mock_parser_class):
+        """Test parser instances are shared between CLIs with equal configuration."""
+        mock_parser_class.side_effect = lambda *args: Mock()
+
+        cli1 = CLIFactory.create_stdin_cli(AppConfig(default_year=2024), ParserConfig())
+        cli2 = CLIFactory.create_stdin_cli(AppConfig(default_year=2024), ParserConfig())
+        cli3 = CLIFactory.create_stdin_cli(AppConfig(default_year=2023), ParserConfig())
+
+        self.assertIs(cli1.processor.parser, cli2.processor.parser)
+        self.assertIs(cli1.processor.parser, cli1.data_writer.parser)
+        self.assertIsNot(cli1.processor.parser, cli3.processor.parser)
+        self.assertEqual(mock_parser_class.call_count, 2)
+
+    @patch('shipping_parser.ShippingDataParser')
     def test_create_file_cli(self, mock_parser_class):
         """Test creating file-based CLI."""
         mock_parser = Mock()
@@ -415,8 +640,16 @@ class TestCLIFactory(unittest.TestCase):
             self.assertIsInstance(cli.data_reader, FileDataReader)
             self.assertEqual(cli.config.output_filename, "output.xlsx")
 
+    @patch('shipping_parser.ShippingDataParser')
+    def test_create_file_cli_csv_output(self, mock_parser_class):
+        """Test a .csv output file selects the CSV writer."""
+        with tempfile.NamedTemporaryFile() as temp_file:
+            cli = CLIFactory.create_file_cli(temp_file.name, "output.csv")
+
+            self.assertIsInstance(cli.data_writer, CsvDataWriter)
+
     @patch('cli.AppConfig.from_env')
-    @patch('cli.ShippingDataParser')
+    @patch('shipping_parser.ShippingDataParser')
     def test_create_from_env(self, mock_parser_class, mock_config_from_env):
         """Test creating CLI from environment variables."""
         mock_parser = Mock()
@@ -445,6 +678,17 @@ class TestArgumentParsing(unittest.TestCase):
         help_text = parser.format_help()
         self.assertIn("shipping data", help_text.lower())
 
+    def test_create_argument_parser_returns_fresh_parser(self):
+        """Test changes to one argument parser do not leak into the next."""
+        parser = create_argument_parser()
+        parser.add_argument('--extra')
+        parser.set_defaults(output='other.xlsx')
+
+        args = create_argument_parser().parse_args([])
+
+        self.assertFalse(hasattr(args, 'extra'))
+        self.assertEqual(args.output, 'parsed_shipping_data.xlsx')
+
     def test_parse_arguments_defaults(self):
         """Test parsing with default arguments."""
         parser = create_argument_parser()
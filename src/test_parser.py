@@ -3,13 +3,14 @@
 Unit tests for shipping data parser.
 """
 
+import re
 import unittest
 from unittest.mock import patch
 from datetime import datetime
 
 from models import ShippingRecord
 from config import AppConfig, ParserConfig
-from shipping_parser import ShippingDataParser
+from shipping_parser import ShippingDataParser, _prefix_tree_pattern
 
 
 class TestShippingRecord(unittest.TestCase):
@@ -51,6 +52,14 @@ class TestShippingRecord(unittest.TestCase):
 
         self.assertEqual(result, expected)
 
+    def test_shipping_record_uses_slots(self):
+        """Test records store fields in slots rather than a per-instance dict."""
+        record = ShippingRecord()
+
+        self.assertFalse(hasattr(record, '__dict__'))
+        with self.assertRaises(AttributeError):
+            record.unknown_field = "value"
+
     def test_is_complete(self):
         """Test checking if record is complete."""
         # Complete record
@@ -209,6 +218,37 @@ class TestShippingDataParser(unittest.TestCase):
                 self.assertEqual(result["start"], expected_start)
                 self.assertEqual(result["end"], expected_end)
 
+    def test_laycan_and_freight_detection_ignores_case(self):
+        """Test laycan and freight detection is case-insensitive."""
+        test_cases = [
+            ("EARLY JUNE usd 35 PMT", "EARLY JUNE", "usd 35 PMT"),
+            ("END June yusd 24k pd", "END June", "yusd 24k pd"),
+            ("ely July uSD HI 2 m", "ely July", "uSD HI 2 m"),
+        ]
+
+        for text, expected_laycan, expected_freight in test_cases:
+            with self.subTest(text=text):
+                record = ShippingRecord()
+                self.parser._extract_laycan_and_freight(text, record)
+                self.assertEqual(record.laycan, expected_laycan)
+                self.assertEqual(record.freight, expected_freight)
+
+    def test_parse_laycan_month_end_handles_leap_years(self):
+        """Test month-end laycans land on the last day of February."""
+        self.assertEqual(self.parser._parse_laycan("2H Feb")["end"], "2024-02-29")
+        self.assertEqual(self.parser._parse_laycan("end Dec")["end"], "2024-12-31")
+
+        self.app_config.default_year = 2025
+        self.assertEqual(self.parser._parse_laycan("2H Feb")["end"], "2025-02-28")
+
+    def test_parse_laycan_returns_fresh_results_from_cache(self):
+        """Test cached laycan results are not shared between callers."""
+        first = self.parser._parse_laycan("25-30 Jun")
+        first["start"] = "mutated"
+
+        self.assertEqual(self.parser._parse_laycan("25-30 Jun"),
+                         {"start": "2024-06-25", "end": "2024-06-30"})
+
     def test_freight_calculation_with_typos(self):
         """Test freight calculation with typo correction."""
         test_cases = [
@@ -285,6 +325,143 @@ class TestShippingDataParser(unittest.TestCase):
                 self.assertEqual(len(records), 1)
                 self.assertEqual(records[0]['Charterer'], charterer)
 
+    def test_parse_records_returns_shipping_records(self):
+        """Test record-level parsing matches the dictionary output."""
+        data = "Seagull 09 10ktons Palm oil E.Malaysia / EC India  Usd 35 pmt  2H June Wilmar"
+
+        records = self.parser.parse_records(data)
+
+        self.assertIsInstance(records[0], ShippingRecord)
+        self.assertEqual(records[0].laycan_start_date, "2024-06-16")
+        self.assertEqual([record.to_dict() for record in records],
+                         self.parser.parse_shipping_data(data))
+        self.assertEqual(self.parser.parse_records("   "), [])
+
+    def test_repeated_lines_do_not_share_records(self):
+        """Test cached line parses hand out independent records."""
+        line = "Seagull 09 10ktons Palm oil E.Malaysia / EC India  Usd 35 pmt  2H June Wilmar"
+
+        first = self.parser._parse_line(line)
+        first.vessel_name = "mutated"
+        second = self.parser._parse_line(line)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(second.vessel_name, "Seagull 09")
+        records = self.parser.parse_shipping_data(f"{line}\n{line}")
+        self.assertEqual(records[0], records[1])
+        self.assertEqual(records[0]["Laycan Start Date"], "2024-06-16")
+
+    def test_line_cache_cleared_when_config_changes(self):
+        """Test cached lines are parsed again after the config lists change."""
+        line = "vessel 10ktons cargo port1 / port2 Usd 30 pmt 1-5 Jul zebra co"
+        self.assertEqual(self.parser.parse_shipping_data(line)[0]['Charterer'], 'N/A')
+
+        self.parser_config.add_charterer("ZEBRA CO")
+
+        self.assertEqual(self.parser.parse_shipping_data(line)[0]['Charterer'], 'ZEBRA CO')
+
+    def test_repeated_lines_log_the_same_warnings(self):
+        """Test a cached line still logs the problems found when it was parsed."""
+        line = "P66 / Seaways Moment / ,MT UCO / Port Klang to USWC / 06-10 June"
+
+        with self.assertLogs('shipping_parser', level='WARNING') as logs:
+            self.parser.parse_shipping_data(f"{line}\n{line}")
+
+        self.assertEqual(
+            [message for message in logs.output if 'Could not parse quantity' in message],
+            ['WARNING:shipping_parser:Could not parse quantity: '] * 2
+        )
+
+    def test_distinct_lines_share_cargo_and_port_strings(self):
+        """Test cargo and port names are interned across records."""
+        first = self.parser._parse_line("Boxer 35ktons Benzene China / ARA 1-10 Jul Petroineos")
+        second = self.parser._parse_line("Sonar 30ktons Benzene China / ARA 5-15 Jul Petroineos")
+
+        self.assertIs(first.cargo, second.cargo)
+        self.assertIs(first.load_port, second.load_port)
+        self.assertIs(first.discharge_port, second.discharge_port)
+
+    def test_parse_stream_skips_malformed_lines(self):
+        """Test a line failing with a parsing error is counted and skipped."""
+        lines = ["bad line", "Seagull 09 10ktons Palm oil E.Malaysia / EC India  Usd 35 pmt  2H June Wilmar"]
+        original = self.parser._parse_line
+
+        def parse_line(line):
+            if line == "bad line":
+                raise ValueError("malformed")
+            return original(line)
+
+        with patch.object(self.parser, '_parse_line', side_effect=parse_line):
+            records = list(self.parser.parse_stream(lines))
+
+        self.assertEqual([record['Vessel Name'] for record in records], ['Seagull 09'])
+
+    def test_parse_stream_propagates_unexpected_errors(self):
+        """Test errors that do not come from malformed input are not swallowed."""
+        with patch.object(self.parser, '_parse_line', side_effect=RuntimeError("bug")):
+            with self.assertRaises(RuntimeError):
+                list(self.parser.parse_stream(["Seagull 09 10ktons Palm oil"]))
+
+    def test_charterer_matching_prefers_longest_name(self):
+        """Test overlapping charterer names resolve to the longest, canonical name."""
+        parser_config = ParserConfig()
+        parser_config.add_charterer("SK")
+        parser = ShippingDataParser(self.app_config, parser_config)
+
+        records = parser.parse_shipping_data(
+            "vessel 10ktons cargo port1 / port2 Usd 30 pmt 1-5 Jul sk energy"
+        )
+
+        self.assertEqual(records[0]['Charterer'], 'SK Energy')
+        self.assertEqual(records[0]['Vessel Name'], 'vessel')
+
+    def test_charterer_priority_and_removal(self):
+        """Test the earliest charterer in the line wins and only it is removed."""
+        record = ShippingRecord()
+
+        line = self.parser._extract_charterer("Olam cargo for NOVA then Olam", record)
+
+        self.assertEqual(record.charterer, 'Olam')
+        self.assertEqual(line, "cargo for NOVA then Olam")
+
+    def test_charterer_added_after_construction(self):
+        """Test charterers added to the config of an existing parser are recognised."""
+        self.parser.parse_shipping_data("vessel 10ktons cargo port1 / port2 Usd 30 pmt 1-5 Jul Nova")
+
+        self.parser_config.add_charterer("ZEBRA CO")
+        records = self.parser.parse_shipping_data(
+            "vessel 10ktons cargo port1 / port2 Usd 30 pmt 1-5 Jul zebra co\n"
+            "ZEBRA CO / Seaways Moment / 32,000MT UCO / Port Klang to USWC / 06-10 June"
+        )
+
+        self.assertEqual([record['Charterer'] for record in records], ['ZEBRA CO', 'ZEBRA CO'])
+        self.assertEqual(records[1]['Vessel Name'], 'Seaways Moment')
+
+    def test_cargo_pattern_added_after_construction(self):
+        """Test cargo patterns added to the config of an existing parser are recognised."""
+        self.parser.parse_shipping_data("vessel 10ktons POP port1 / port2 Usd 30 pmt 1-5 Jul Nova")
+
+        self.parser_config.add_cargo_pattern(r'Mixed\s+Xylenes')
+        records = self.parser.parse_shipping_data(
+            "vessel 10ktons Mixed Xylenes Ulsan / Taiwan Usd 30 pmt 1-5 Jul Nova"
+        )
+
+        self.assertEqual(records[0]['Cargo'], 'Mixed Xylenes')
+        self.assertEqual(records[0]['Load Port'], 'Ulsan')
+
+    def test_prefix_tree_pattern_prefers_longest_word(self):
+        """Test the factored charterer alternation matches like a longest-first one."""
+        pattern = re.compile(
+            r'\b' + _prefix_tree_pattern(["SK", "SK Energy", "Nova", "Neste"]) + r'\b',
+            re.IGNORECASE
+        )
+
+        self.assertEqual(pattern.search("vessel sk energy").group(0), "sk energy")
+        self.assertEqual(pattern.search("vessel SK Energyx").group(0), "SK")
+        self.assertEqual(pattern.search("NESTE / Nova").group(0), "NESTE")
+        self.assertIsNone(pattern.search("Novas"))
+        self.assertIsNone(re.search(_prefix_tree_pattern([]), "anything"))
+
     def test_parse_multiple_records(self):
         """Test parsing multiple records at once."""
         multi_input = """Seagull 09 10ktons Palm oil E.Malaysia / EC India  Usd 35 pmt  2H June Wilmar
@@ -299,6 +476,24 @@ P66 / Seaways Moment / 32,000MT UCO + Tallow / Port Klang to USWC / 06-10 June /
         actual_vessels = [record['Vessel Name'] for record in records]
         self.assertEqual(actual_vessels, expected_vessels)
 
+    def test_parse_stream_matches_batch_parsing(self):
+        """Test streaming parse yields the same records as batch parsing."""
+        lines = [
+            "Seagull 09 10ktons Palm oil E.Malaysia / EC India  Usd 35 pmt  2H June Wilmar\n",
+            "\n",
+            "Dai Thanh   12ktons POP   Balikpapan / South China   Usd 29.00 pmt 25-30 Jun Nova\n",
+        ]
+
+        stream = self.parser.parse_stream(iter(lines))
+        self.assertEqual(next(stream)['Vessel Name'], 'Seagull 09')
+        self.assertEqual(
+            [record['Vessel Name'] for record in stream], ['Dai Thanh']
+        )
+        self.assertEqual(
+            list(self.parser.parse_stream(lines)),
+            self.parser.parse_shipping_data("".join(lines))
+        )
+
     def test_line_cleaning_suffixes(self):
         """Test removal of status suffixes."""
         test_cases = [
@@ -312,6 +507,20 @@ P66 / Seaways Moment / 32,000MT UCO + Tallow / Port Klang to USWC / 06-10 June /
                 self.assertEqual(len(records), 1)
                 self.assertEqual(records[0]['Charterer'], expected_charterer)
 
+    def test_clean_line_suffixes_direct(self):
+        """Test suffix stripping, including stacked and upper-case suffixes."""
+        test_cases = [
+            ("Sea Gull 18 Olam bss sth - FAILED", "Sea Gull 18 Olam"),
+            ("Alfred N Usd 2.85 M ENI 1/1", "Alfred N Usd 2.85 M ENI"),
+            ("Ocean Star 10ktons Olam n Trip T/C 60 days", "Ocean Star 10ktons Olam"),
+            ("Seagull 09 10ktons Palm oil E.Malaysia / EC India  Usd 35 pmt  2H June Wilmar",
+             "Seagull 09 10ktons Palm oil E.Malaysia / EC India  Usd 35 pmt  2H June Wilmar"),
+        ]
+
+        for line, expected in test_cases:
+            with self.subTest(line=line):
+                self.assertEqual(self.parser._clean_line_suffixes(line), expected)
+
     def test_year_rollover_in_laycan(self):
         """Test handling of dates that cross year boundaries."""
         # Create parser with December 2024 as default year
@@ -342,21 +551,25 @@ P66 / Seaways Moment / 32,000MT UCO + Tallow / Port Klang to USWC / 06-10 June /
         self.assertTrue(stats['freight_calculation_enabled'])
         self.assertEqual(stats['default_year'], 2024)
 
-    @patch('shipping_parser.pd.DataFrame.to_excel')
-    def test_save_to_excel_success(self, mock_to_excel):
+    @patch('shipping_parser.Workbook')
+    def test_save_to_excel_success(self, mock_workbook_class):
         """Test successful Excel file saving."""
-        mock_to_excel.return_value = None  # Successful save
+        mock_workbook = mock_workbook_class.return_value
+        mock_sheet = mock_workbook.create_sheet.return_value
 
         test_records = [{'Vessel Name': 'Test', 'Cargo': 'Test Cargo'}]
         result = self.parser.save_to_excel(test_records, "test.xlsx")
 
         self.assertTrue(result)
-        mock_to_excel.assert_called_once_with("test.xlsx", index=False, engine='openpyxl')
+        mock_workbook_class.assert_called_once_with(write_only=True)
+        mock_sheet.append.assert_any_call(['Vessel Name', 'Cargo'])
+        mock_sheet.append.assert_any_call(['Test', 'Test Cargo'])
+        mock_workbook.save.assert_called_once_with("test.xlsx")
 
-    @patch('shipping_parser.pd.DataFrame.to_excel')
-    def test_save_to_excel_failure(self, mock_to_excel):
+    @patch('shipping_parser.Workbook')
+    def test_save_to_excel_failure(self, mock_workbook_class):
         """Test Excel file saving failure."""
-        mock_to_excel.side_effect = Exception("Save failed")
+        mock_workbook_class.return_value.save.side_effect = Exception("Save failed")
 
         test_records = [{'Vessel Name': 'Test', 'Cargo': 'Test Cargo'}]
         result = self.parser.save_to_excel(test_records, "test.xlsx")